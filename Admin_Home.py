@@ -1,7 +1,6 @@
 import streamlit as st
-import pd
-import json
-from helpers import get_redis, get_club_settings, get_category
+import pandas as pd
+from helpers import get_redis, get_club_settings, get_result_seasons, get_leaderboard
 
 st.set_page_config(page_title="BBPB - Admin", layout="wide")
 r = get_redis()
@@ -24,25 +23,14 @@ else:
 
 st.title("🏃 Bramley Breezers Results & Championship")
 
-raw_res = r.lrange("race_results", 0, -1)
-raw_mem = r.lrange("members", 0, -1)
-members_data = [json.loads(m) for m in raw_mem]
-active_names = [m['name'] for m in members_data if m.get('status', 'Active') == 'Active']
+seasons = get_result_seasons(r)
 
-if raw_res:
-    cache_pb = r.get("cached_pb_leaderboard")
-    df = pd.read_json(cache_pb) if cache_pb else pd.DataFrame([json.loads(res) for res in raw_res])
-    
-    df['race_date_dt'] = pd.to_datetime(df['race_date'])
-    years = ["All-Time"] + sorted([str(y) for y in df['race_date_dt'].dt.year.unique()], reverse=True)
+if seasons:
+    years = ["All-Time"] + seasons
     sel_year = st.selectbox("View Season:", years, key="admin_home_filter")
     
-    disp_df = df.copy()
-    if sel_year != "All-Time":
-        disp_df = disp_df[disp_df['race_date_dt'].dt.year == int(sel_year)]
-        
-    age_mode = settings['age_mode']
-    disp_df['Category'] = disp_df.apply(lambda x: get_category(x['dob'], x['race_date'], age_mode), axis=1)
+    # Precomputed leaders (Age on Day bands, as get_category)
+    leaders = pd.DataFrame(get_leaderboard(r, sel_year, "Age on Day"))
 
     for d in ["5k", "10k", "10 Mile", "HM", "Marathon"]:
         st.markdown(f"### 🏁 {d}")
@@ -51,11 +39,10 @@ if raw_res:
             with col:
                 bg, tc = ("#003366", "white") if gen == "Male" else ("#FFD700", "#003366")
                 st.markdown(f'''<div style="background:{bg}; color:{tc}; padding:8px; border-radius:8px 8px 0 0; text-align:center; font-weight:bold; border:2px solid #003366;">{gen.upper()}</div>''', unsafe_allow_html=True)
-                sub = disp_df[(disp_df['distance'] == d) & (disp_df['gender'] == gen)]
+                sub = leaders[(leaders['distance'] == d) & (leaders['gender'] == gen)] if not leaders.empty else leaders
                 if not sub.empty:
-                    leaders = sub.sort_values('time_seconds').groupby('Category').head(1)
-                    for _, row in leaders.sort_values('Category').iterrows():
-                        opacity = "1.0" if row['name'] in active_names else "0.5"
+                    for _, row in sub.sort_values('Category').iterrows():
+                        opacity = "1.0" if row['active'] else "0.5"
                         st.markdown(f'''<div style="border:2px solid #003366; border-top:none; padding:10px; background:white; margin-bottom:-2px; display:flex; justify-content:space-between; align-items:center; opacity:{opacity};"><div><span style="background:#FFD700; color:#003366; padding:2px 5px; border-radius:3px; font-weight:bold; font-size:0.75em; margin-right:5px;">{row['Category']}</span><b style="color:#003366;">{row['name']}</b><br><small style="color:#666;">{row['location']} ({row['race_date']})</small></div><div style="font-weight:bold; color:#003366; font-size:1.1em;">{row['time_display']}</div></div>''', unsafe_allow_html=True)
                 else:
                     st.markdown('<div style="border:2px solid #003366; border-top:none; padding:10px; text-align:center; color:#666;">No records</div>', unsafe_allow_html=True)
@@ -14,6 +14,58 @@ from datetime import datetime, date, timedelta
 from functools import lru_cache
 from typing import List, Dict, Any, Optional, Tuple
 import time
+import pickle
+import threading
+from collections import OrderedDict
+
+from helpers import (
+    get_cached_redis,
+    get_race_results,
+    update_race_result,
+    delete_race_result,
+    clear_race_results,
+    count_race_results,
+    get_race_results_page,
+    get_result_seasons,
+    count_season_results,
+    get_leaderboard,
+    get_cache_generation,
+    PB_LEADERS_KEY,
+    rebuild_pb_caches,
+    recompute_categories,
+    update_member_results,
+    import_members,
+    import_race_results,
+    import_champ_results,
+    import_csv,
+    approve_pb_submission,
+    approve_champ_submission,
+    approve_pb_submissions,
+    approve_champ_submissions,
+    reject_submissions,
+    reject_submission,
+    claim_submissions,
+    clear_submission_queues,
+    get_queue_consumer,
+    PB_QUEUE_KEY,
+    CHAMP_QUEUE_KEY,
+    rebuild_champ_standings,
+    request_leaderboard_rebuild,
+    get_champ_standings,
+    fetch_snapshot,
+    set_champ_season,
+    save_champ_calendar,
+    export_champ_seasons,
+    update_champ_result,
+    delete_champ_result,
+    archive_season,
+    unarchive_season,
+    get_archived_seasons,
+    get_archived_results,
+    get_generations,
+    bump_generation,
+    GENERATIONS_KEY,
+)
 
 # Set page config FIRST
 st.set_page_config(
@@ -27,15 +79,21 @@ st.set_page_config(
 # SECTION 2: OPTIMIZED REDIS MANAGER
 # ============================================================
 class RedisManager:
-    """Singleton Redis connection manager with smart caching"""
+    """Singleton Redis connection manager with a bounded LRU + TTL cache"""
     _instance = None
     _connection = None
+    _reader = None
+    
+    CACHE_MAX_ENTRIES = 256
+    CACHE_MAX_BYTES = 64 * 1024 * 1024
     
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
-            cls._instance._cache = {}
-            cls._instance._last_refresh = {}
+            cls._instance._cache = OrderedDict()
+            cls._instance._cache_bytes = 0
+            cls._instance._cache_lock = threading.Lock()
+            cls._instance._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0}
         return cls._instance
     
     @property
@@ -56,26 +114,70 @@ class RedisManager:
                 return None
         return self._connection
     
+    @property
+    def reader(self):
+        """Read-only client with server-assisted client-side caching (RESP3 CLIENT TRACKING).
+        Repeat reads are answered locally until Redis pushes an invalidation for the key.
+        This is helpers.get_cached_redis(), so the app and the pages share one tracking
+        connection pool; falls back to conn if it cannot connect. Never use it inside
+        WATCH transactions."""
+        if self._reader is None:
+            try:
+                self._reader = get_cached_redis()
+            except Exception:
+                self._reader = False
+        return self._reader or self.conn
+    
+    def _drop(self, key: str):
+        _, _, size = self._cache.pop(key)
+        self._cache_bytes -= size
+    
     def get_cached(self, key: str, max_age: int = 60) -> Optional[Any]:
-        if key in self._cache:
-            data, timestamp = self._cache[key]
-            if (datetime.now() - timestamp).seconds < max_age:
-                return data
-        return None
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is not None and time.monotonic() - entry[1] >= max_age:
+                self._drop(key)
+                self._stats["expired"] += 1
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._cache.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[0]
     
     def set_cached(self, key: str, data: Any):
-        self._cache[key] = (data, datetime.now())
+        size = len(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+        with self._cache_lock:
+            if key in self._cache:
+                self._drop(key)
+            if size > self.CACHE_MAX_BYTES:
+                return
+            self._cache[key] = (data, time.monotonic(), size)
+            self._cache_bytes += size
+            while len(self._cache) > self.CACHE_MAX_ENTRIES or self._cache_bytes > self.CACHE_MAX_BYTES:
+                self._drop(next(iter(self._cache)))
+                self._stats["evictions"] += 1
     
     def clear_cache(self, key_prefix: str = None):
-        if key_prefix:
+        with self._cache_lock:
             for k in list(self._cache.keys()):
-                if k.startswith(key_prefix):
-                    del self._cache[k]
-        else:
-            self._cache.clear()
+                if key_prefix is None or k.startswith(key_prefix):
+                    self._drop(k)
+    
+    def cache_stats(self) -> Dict[str, int]:
+        with self._cache_lock:
+            return {**self._stats, "entries": len(self._cache), "bytes": self._cache_bytes}
+
+# Streamlit re-executes this script on every rerun, so the manager (its
+# connections and LRU cache) is kept as a cached resource shared by all reruns
+# and sessions of this process.
+@st.cache_resource
+def get_redis_manager() -> RedisManager:
+    return RedisManager()
 
 # Global instance
-redis_mgr = RedisManager()
+redis_mgr = get_redis_manager()
 
 # ============================================================
 # SECTION 3: AUTHENTICATION
@@ -127,36 +229,59 @@ def render_login():
 # ============================================================
 # SECTION 4: DATA LOADERS WITH CACHING
 # ============================================================
-@st.cache_data(ttl=300)
+# Cache entries are keyed on the dataset's generation counter in Redis, so
+# a write anywhere (this process or another) invalidates just that dataset.
+# redis_mgr is the only cache layer; superseded generations age out of its LRU.
+def current_generation(dataset: str) -> int:
+    r = redis_mgr.reader
+    if not r:
+        return 0
+    return get_generations(r)[dataset]
+
 def load_members(_redis_mgr: RedisManager) -> List[Dict]:
     r = _redis_mgr.conn
     if not r:
         return []
     
-    cached = _redis_mgr.get_cached("members_data", max_age=120)
-    if cached:
+    key = f"members_data:{current_generation('members')}"
+    cached = _redis_mgr.get_cached(key, max_age=300)
+    if cached is not None:
         return cached
     
-    raw = r.lrange("members", 0, -1)
+    raw = _redis_mgr.reader.lrange("members", 0, -1)
     members = [json.loads(m) for m in raw]
-    _redis_mgr.set_cached("members_data", members)
+    _redis_mgr.set_cached(key, members)
     return members
 
-@st.cache_data(ttl=60)
 def load_race_results(_redis_mgr: RedisManager) -> List[Dict]:
     r = _redis_mgr.conn
     if not r:
         return []
     
-    cached = _redis_mgr.get_cached("race_results_data", max_age=30)
-    if cached:
+    key = f"race_results_data:{current_generation('results')}"
+    cached = _redis_mgr.get_cached(key, max_age=300)
+    if cached is not None:
         return cached
     
-    raw = r.lrange("race_results", 0, -1)
-    results = [json.loads(r) for r in raw]
-    _redis_mgr.set_cached("race_results_data", results)
+    results = get_race_results(r)
+    _redis_mgr.set_cached(key, results)
     return results
 
+def load_leaders(season: str, age_mode: str) -> List[Dict]:
+    """Leaderboard rows, cached on the generation of cached_pb_leaders"""
+    r = redis_mgr.conn
+    if not r:
+        return []
+    
+    key = f"pb_leaders:{season}:{age_mode}:{get_cache_generation(redis_mgr.reader, PB_LEADERS_KEY)}"
+    cached = redis_mgr.get_cached(key, max_age=300)
+    if cached is not None:
+        return cached
+    
+    leaders = get_leaderboard(r, season, age_mode)
+    redis_mgr.set_cached(key, leaders)
+    return leaders
+
 def get_member_dict() -> Dict[str, Dict]:
     members = load_members(redis_mgr)
     return {m['name']: m for m in members}
@@ -200,15 +325,26 @@ def seconds_to_time(seconds: int) -> str:
     secs = seconds % 60
     return f"{hours:02d}:{minutes:02d}:{secs:02d}"
 
+def get_age_mode() -> str:
+    """Club age category mode ("5Y"/"10Y"), cached so per-row callers don't hit Redis"""
+    generation = current_generation("settings")
+    cached = redis_mgr.get_cached(f"age_mode:{generation}", max_age=300)
+    if cached is not None:
+        return cached
+    
+    r = redis_mgr.reader
+    if not r:
+        return "10Y"
+    stored = r.get("age_mode") or "5 Year"
+    age_mode = "5Y" if "5" in stored else "10Y"
+    redis_mgr.set_cached(f"age_mode:{generation}", age_mode)
+    return age_mode
+
 def get_category(dob_str: str, race_date_str: str, age_mode: str = None) -> str:
+    """Scalar category; use helpers.get_categories for whole columns"""
     try:
         if age_mode is None:
-            r = redis_mgr.conn
-            if r:
-                stored = r.get("age_mode") or "5 Year"
-                age_mode = "5Y" if "5" in stored else "10Y"
-            else:
-                age_mode = "10Y"
+            age_mode = get_age_mode()
         
         dob = datetime.strptime(str(dob_str), '%Y-%m-%d')
         race_date = datetime.strptime(str(race_date_str), '%Y-%m-%d')
@@ -237,26 +373,18 @@ def get_seconds(t_str: str) -> int:
     """Alias for time_to_seconds for compatibility with 4_Championship.py"""
     return time_to_seconds(t_str)
 
-def rebuild_leaderboard_cache():
+def rebuild_leaderboard_cache(wait: bool = False):
+    """Queue a background rebuild of the leaderboard caches (or run it now with wait=True)"""
     r = redis_mgr.conn
     if not r:
         return False
     
     try:
-        raw_results = r.lrange("race_results", 0, -1)
-        if not raw_results:
-            r.delete("cached_pb_leaderboard")
-            return True
-        
-        results = [json.loads(res) for res in raw_results]
-        df = pd.DataFrame(results)
-        df['race_date_dt'] = pd.to_datetime(df['race_date'])
-        r.set("cached_pb_leaderboard", df.to_json())
-        
-        redis_mgr.clear_cache("members_data")
-        redis_mgr.clear_cache("race_results_data")
-        st.cache_data.clear()
-        
+        if wait:
+            rebuild_pb_caches(r)
+            rebuild_champ_standings(r)
+        else:
+            request_leaderboard_rebuild(r)
         return True
     except Exception as e:
         st.error(f"Cache rebuild failed: {e}")
@@ -267,7 +395,7 @@ def rebuild_leaderboard_cache():
 # ============================================================
 def render_sidebar():
     with st.sidebar:
-        r = redis_mgr.conn
+        r = redis_mgr.reader
         logo_url = None
         if r:
             logo_url = r.get("club_logo_url") or r.get("logo_url")
@@ -288,7 +416,6 @@ def render_sidebar():
         if st.button("🚪 Logout", use_container_width=True, type="secondary"):
             st.session_state.authenticated = False
             redis_mgr.clear_cache()
-            st.cache_data.clear()
             st.rerun()
         
         st.divider()
@@ -314,20 +441,18 @@ def render_sidebar():
                 key=f"nav_{tab_key}"
             ):
                 st.session_state.current_tab = tab_key
-                if tab_key == "leaderboard":
-                    st.cache_data.clear()
                 st.rerun()
         
         st.divider()
         
         st.subheader("📊 Quick Stats")
         
-        members = load_members(redis_mgr)
-        results = load_race_results(redis_mgr)
+        stats = fetch_snapshot(redis_mgr.conn, "members", "result_count")
+        members = stats["members"]
         
         active_count = len([m for m in members if m.get('status', 'Active') == 'Active'])
         left_count = len([m for m in members if m.get('status') == 'Left'])
-        race_count = len(results)
+        race_count = stats["result_count"]
         
         col1, col2 = st.columns(2)
         col1.metric("Active", active_count)
@@ -339,7 +464,6 @@ def render_sidebar():
         st.divider()
         if st.button("🔄 Refresh All Data", use_container_width=True):
             redis_mgr.clear_cache()
-            st.cache_data.clear()
             st.success("Cache cleared!")
             time.sleep(0.5)
             st.rerun()
@@ -355,58 +479,24 @@ def render_leaderboard_tab():
         st.error("Redis connection unavailable")
         return
     
-    cached_json = r.get("cached_pb_leaderboard")
-    
-    if cached_json:
-        try:
-            df = pd.read_json(cached_json)
-            cache_status = "✅ Using cached leaderboard"
-        except:
-            cache_status = "⚠️ Cache corrupted, rebuilding..."
-            cached_json = None
-    
-    if not cached_json:
-        with st.spinner("Building leaderboard from raw data..."):
-            results = load_race_results(redis_mgr)
-            if not results:
-                st.info("No race results found in database.")
-                return
-            
-            df = pd.DataFrame(results)
-            df['race_date_dt'] = pd.to_datetime(df['race_date'])
-            r.set("cached_pb_leaderboard", df.to_json())
-            cache_status = "🔄 Built new leaderboard cache"
-    
-    st.sidebar.caption(cache_status)
-    
-    members = load_members(redis_mgr)
-    active_names = [m['name'] for m in members if m.get('status', 'Active') == 'Active']
-    
-    df['race_date_dt'] = pd.to_datetime(df['race_date'])
-    years = ["All-Time"] + sorted(
-        [str(y) for y in df['race_date_dt'].dt.year.unique()],
-        reverse=True
-    )
+    years = ["All-Time"] + get_result_seasons(r)
+    if len(years) == 1:
+        st.info("No race results found in database.")
+        return
     
     col1, col2, col3 = st.columns([2, 1, 1])
     with col1:
         selected_year = st.selectbox("Select Season:", years, key="year_filter")
     
-    display_df = df.copy()
-    if selected_year != "All-Time":
-        display_df = display_df[display_df['race_date_dt'].dt.year == int(selected_year)]
-    
-    age_mode_setting = r.get("age_mode") or "5 Year"
-    age_mode = "5Y" if "5" in age_mode_setting else "10Y"
+    age_mode = get_age_mode()
     
-    display_df['Category'] = display_df.apply(
-        lambda x: get_category(x['dob'], x['race_date'], age_mode),
-        axis=1
-    )
+    # Leaders are precomputed per season on rebuild, with their category
+    # and active flag, so a render reads a few KB rather than every result
+    leaders = pd.DataFrame(load_leaders(selected_year, age_mode))
+    st.sidebar.caption("✅ Using precomputed leaders")
     
-    total_records = len(display_df)
-    unique_members = display_df['name'].nunique()
-    st.caption(f"Showing {total_records} results for {unique_members} members")
+    total_records = count_season_results(r, selected_year)
+    st.caption(f"Showing leaders from {total_records} results")
     
     distances = ["5k", "10k", "10 Mile", "HM", "Marathon"]
     
@@ -421,16 +511,14 @@ def render_leaderboard_tab():
                 unsafe_allow_html=True
             )
             
-            male_data = display_df[
-                (display_df['distance'] == distance) & 
-                (display_df['gender'] == 'Male')
-            ]
+            male_leaders = leaders[
+                (leaders['distance'] == distance) & 
+                (leaders['gender'] == 'Male')
+            ] if not leaders.empty else leaders
             
-            if not male_data.empty:
-                leaders = male_data.sort_values('time_seconds').groupby('Category').head(1)
-                
-                for _, row in leaders.sort_values('Category').iterrows():
-                    is_active = row['name'] in active_names
+            if not male_leaders.empty:
+                for _, row in male_leaders.sort_values('Category').iterrows():
+                    is_active = row['active']
                     opacity = "1.0" if is_active else "0.6"
                     
                     html = f'''
@@ -460,16 +548,14 @@ def render_leaderboard_tab():
                 unsafe_allow_html=True
             )
             
-            female_data = display_df[
-                (display_df['distance'] == distance) & 
-                (display_df['gender'] == 'Female')
-            ]
+            female_leaders = leaders[
+                (leaders['distance'] == distance) & 
+                (leaders['gender'] == 'Female')
+            ] if not leaders.empty else leaders
             
-            if not female_data.empty:
-                leaders = female_data.sort_values('time_seconds').groupby('Category').head(1)
-                
-                for _, row in leaders.sort_values('Category').iterrows():
-                    is_active = row['name'] in active_names
+            if not female_leaders.empty:
+                for _, row in female_leaders.sort_values('Category').iterrows():
+                    is_active = row['active']
                     opacity = "1.0" if is_active else "0.6"
                     
                     html = f'''
@@ -524,8 +610,8 @@ def render_members_tab():
                             "gender": new_gender
                         }
                         r.rpush("members", json.dumps(member_data))
-                        redis_mgr.clear_cache("members_data")
-                        st.cache_data.clear()
+                        bump_generation(r, "members")
+                        request_leaderboard_rebuild(r, "leaders")
                         st.success(f"Added member: {new_name}")
                         time.sleep(1)
                         st.rerun()
@@ -542,7 +628,8 @@ def render_members_tab():
         filtered_members = [m for m in members if search_term.lower() in m['name'].lower()]
         st.caption(f"Found {len(filtered_members)} members matching '{search_term}'")
     
-    filtered_members.sort(key=lambda x: x['name'].lower())
+    # load_members() returns the shared cached list, so sort a copy
+    filtered_members = sorted(filtered_members, key=lambda x: x['name'].lower())
     
     for idx, member in enumerate(filtered_members):
         member_key = f"member_{member['name'].replace(' ', '_')}_{idx}"
@@ -584,9 +671,12 @@ def render_members_tab():
                                     if m['name'] == member['name']:
                                         r.lset("members", i, json.dumps(updated_member))
                                         break
-                                redis_mgr.clear_cache("members_data")
-                                redis_mgr.clear_cache("cached_pb_leaderboard")
-                                st.cache_data.clear()
+                                # Keep the copies on this member's results in step
+                                results_changed = update_member_results(r, member['name'],
+                                                                        new_name=updated_member['name'],
+                                                                        dob=edit_dob, gender=edit_gender)
+                                request_leaderboard_rebuild(r, "pb" if results_changed else "leaders")
+                                bump_generation(r, "members")
                                 st.success(f"Updated {edit_name}")
                                 time.sleep(1)
                                 st.rerun()
@@ -601,9 +691,8 @@ def render_members_tab():
                                 if m['name'] == member['name']:
                                     r.lrem("members", 1, raw_member)
                                     break
-                            redis_mgr.clear_cache("members_data")
-                            redis_mgr.clear_cache("cached_pb_leaderboard")
-                            st.cache_data.clear()
+                            bump_generation(r, "members")
+                            request_leaderboard_rebuild(r, "leaders")
                             st.warning(f"Deleted {member['name']}")
                             time.sleep(1)
                             st.rerun()
@@ -611,6 +700,19 @@ def render_members_tab():
 # ============================================================
 # SECTION 9: TAB 3 - PB SUBMISSIONS
 # ============================================================
+def build_pb_entry(submission: Dict, member_info: Dict) -> Dict:
+    """Turn a PB submission into a race result using the member's record"""
+    return {
+        "name": submission['name'],
+        "gender": member_info['gender'],
+        "dob": member_info['dob'],
+        "distance": submission['distance'],
+        "time_seconds": time_to_seconds(submission['time_display']),
+        "time_display": format_time_string(submission['time_display']),
+        "location": submission['location'],
+        "race_date": submission['race_date']
+    }
+
 def render_submissions_tab():
     st.title("📥 PB Submissions Approval")
     
@@ -619,17 +721,38 @@ def render_submissions_tab():
         st.error("Redis connection unavailable")
         return
     
-    pending_raw = r.lrange("pending_results", 0, -1)
-    pending = [json.loads(p) for p in pending_raw]
+    claimed = claim_submissions(r, PB_QUEUE_KEY, get_queue_consumer())
     
-    if not pending:
+    if not claimed:
         st.info("✅ No pending PB submissions.")
         return
     
-    st.subheader(f"Pending Submissions ({len(pending)})")
+    st.subheader(f"Pending Submissions ({fetch_snapshot(r, 'pb_pending_count')['pb_pending_count']})")
+    st.caption(f"Showing the {len(claimed)} claimed by this session")
     member_dict = get_member_dict()
+    submissions = [(entry_id, json.loads(raw)) for entry_id, raw in claimed]
+    
+    with st.expander("☑️ Bulk Actions"):
+        selected = st.multiselect(
+            "Select submissions",
+            range(len(submissions)),
+            format_func=lambda i: f"{submissions[i][1]['name']} - {submissions[i][1]['distance']} ({submissions[i][1]['time_display']})"
+        )
+        col1, col2 = st.columns(2)
+        if col1.button("✅ Approve Selected", disabled=not selected, use_container_width=True):
+            items = [(submissions[i][0], build_pb_entry(submissions[i][1], member_dict[submissions[i][1]['name']]))
+                     for i in selected if submissions[i][1]['name'] in member_dict]
+            approved = approve_pb_submissions(r, items)
+            st.session_state['bulk_msg'] = f"Approved {approved} of {len(selected)} selected (unknown members are skipped)"
+            st.rerun()
+        if col2.button("❌ Reject Selected", disabled=not selected, use_container_width=True):
+            rejected = reject_submissions(r, PB_QUEUE_KEY, [submissions[i][0] for i in selected])
+            st.session_state['bulk_msg'] = f"Rejected {rejected} submissions"
+            st.rerun()
+        if 'bulk_msg' in st.session_state:
+            st.success(st.session_state.pop('bulk_msg'))
     
-    for idx, submission in enumerate(pending):
+    for idx, (entry_id, submission) in enumerate(submissions):
         with st.container(border=True):
             col1, col2 = st.columns([3, 1])
             
@@ -646,27 +769,16 @@ def render_submissions_tab():
                     continue
                 
                 if st.button("✅ Approve", key=f"approve_{idx}", use_container_width=True):
-                    race_entry = {
-                        "name": submission['name'],
-                        "gender": member_info['gender'],
-                        "dob": member_info['dob'],
-                        "distance": submission['distance'],
-                        "time_seconds": time_to_seconds(submission['time_display']),
-                        "time_display": format_time_string(submission['time_display']),
-                        "location": submission['location'],
-                        "race_date": submission['race_date']
-                    }
-                    r.rpush("race_results", json.dumps(race_entry))
-                    r.lrem("pending_results", 1, json.dumps(submission))
-                    redis_mgr.clear_cache("race_results_data")
-                    redis_mgr.clear_cache("cached_pb_leaderboard")
-                    st.cache_data.clear()
-                    st.success(f"Approved PB for {submission['name']}")
+                    race_entry = build_pb_entry(submission, member_info)
+                    if approve_pb_submission(r, entry_id, race_entry) is None:
+                        st.warning("This submission was already handled by another admin")
+                    else:
+                        st.success(f"Approved PB for {submission['name']}")
                     time.sleep(1)
                     st.rerun()
                 
                 if st.button("❌ Reject", key=f"reject_{idx}", use_container_width=True, type="secondary"):
-                    r.lrem("pending_results", 1, json.dumps(submission))
+                    reject_submission(r, PB_QUEUE_KEY, entry_id)
                     st.warning(f"Rejected submission for {submission['name']}")
                     time.sleep(1)
                     st.rerun()
@@ -677,82 +789,74 @@ def render_submissions_tab():
 def render_racelog_tab():
     st.title("📋 Race Log Management")
     
-    results = load_race_results(redis_mgr)
+    r = redis_mgr.conn
+    if not r:
+        st.error("Redis connection unavailable")
+        return
     
-    if not results:
+    total_results = count_race_results(r)
+    
+    if not total_results:
         st.info("No race results in database.")
         return
     
-    st.subheader(f"Race Results ({len(results)} total)")
-    df = pd.DataFrame(results)
-    df['date_dt'] = pd.to_datetime(df['race_date'])
-    df = df.sort_values('date_dt', ascending=False)
+    st.subheader(f"Race Results ({total_results} total)")
     
     col1, col2, col3 = st.columns(3)
     with col1:
         search_name = st.text_input("Search by name", "")
     with col2:
         filter_distance = st.selectbox("Filter by distance", 
-                                     ["All"] + sorted(df['distance'].unique().tolist()))
+                                     ["All", "5k", "10k", "10 Mile", "HM", "Marathon"])
     with col3:
         items_per_page = st.selectbox("Results per page", [10, 25, 50, 100], index=1)
     
-    filtered_df = df.copy()
-    if search_name:
-        filtered_df = filtered_df[filtered_df['name'].str.contains(search_name, case=False, na=False)]
-    if filter_distance != "All":
-        filtered_df = filtered_df[filtered_df['distance'] == filter_distance]
-    
-    total_pages = max(1, (len(filtered_df) + items_per_page - 1) // items_per_page)
-    page_number = st.number_input("Page", min_value=1, max_value=total_pages, value=1)
+    # Only the visible page is fetched, newest first, from the date index
+    filters = {
+        "distance": None if filter_distance == "All" else filter_distance,
+        "name": search_name or None
+    }
+    page_number = st.session_state.get("racelog_page", 1)
+    page_results, total_matches = get_race_results_page(r, page_number, items_per_page, **filters)
+    
+    total_pages = max(1, (total_matches + items_per_page - 1) // items_per_page)
+    if page_number > total_pages:
+        page_number = total_pages
+        st.session_state.racelog_page = page_number
+        page_results, total_matches = get_race_results_page(r, page_number, items_per_page, **filters)
+    st.number_input("Page", min_value=1, max_value=total_pages, key="racelog_page")
     
     start_idx = (page_number - 1) * items_per_page
-    end_idx = min(start_idx + items_per_page, len(filtered_df))
+    end_idx = start_idx + len(page_results)
     
-    st.caption(f"Showing {start_idx + 1}-{end_idx} of {len(filtered_df)} results")
+    st.caption(f"Showing {start_idx + 1}-{end_idx} of {total_matches} results")
     
-    for idx in range(start_idx, end_idx):
-        result = filtered_df.iloc[idx]
-        
-        r = redis_mgr.conn
-        if not r:
-            continue
-        
-        raw_results = r.lrange("race_results", 0, -1)
-        redis_idx = None
-        for i, raw in enumerate(raw_results):
-            if json.loads(raw)['name'] == result['name'] and \
-               json.loads(raw)['race_date'] == result['race_date'] and \
-               json.loads(raw)['distance'] == result['distance']:
-                redis_idx = i
-                break
+    # Each loaded record carries its storage ID, so rows map straight to
+    # their hash field without re-reading the results per row.
+    for result in page_results:
+        result_id = result['id']
         
         with st.container(border=True):
             col1, col2 = st.columns([4, 1])
             
             with col1:
                 st.markdown(f"**{result['name']}** ({result['gender']})")
-                st.caption(f"{result['distance']} - {result['time_display']}")
+                st.caption(f"{result['distance']} - {result['time_display']} ({result.get('category', 'Unknown')})")
                 st.caption(f"{result['location']} on {result['race_date']}")
             
             with col2:
-                edit_key = f"edit_race_{redis_idx}"
-                if st.button("✏️ Edit", key=f"edit_btn_{redis_idx}", use_container_width=True):
+                edit_key = f"edit_race_{result_id}"
+                if st.button("✏️ Edit", key=f"edit_btn_{result_id}", use_container_width=True):
                     st.session_state[edit_key] = not st.session_state.get(edit_key, False)
                 
-                if st.button("🗑️", key=f"del_btn_{redis_idx}", use_container_width=True, type="secondary"):
-                    if redis_idx is not None:
-                        r.lset("race_results", redis_idx, "DELETE_ME")
-                        r.lrem("race_results", 1, "DELETE_ME")
-                        redis_mgr.clear_cache("race_results_data")
-                        redis_mgr.clear_cache("cached_pb_leaderboard")
-                        st.cache_data.clear()
-                        st.success(f"Deleted race result for {result['name']}")
-                        time.sleep(1)
-                        st.rerun()
+                if st.button("🗑️", key=f"del_btn_{result_id}", use_container_width=True, type="secondary"):
+                    delete_race_result(r, result_id)
+                    st.success(f"Deleted race result for {result['name']}")
+                    time.sleep(1)
+                    st.rerun()
             
             if st.session_state.get(edit_key, False):
-                with st.form(f"edit_race_form_{redis_idx}"):
+                with st.form(f"edit_race_form_{result_id}"):
                     col1, col2, col3 = st.columns(3)
                     
                     edit_name = col1.text_input("Name", result['name'])
@@ -785,11 +889,7 @@ def render_racelog_tab():
                                     "location": edit_location,
                                     "race_date": edit_date
                                 }
-                                if redis_idx is not None:
-                                    r.lset("race_results", redis_idx, json.dumps(updated_entry))
-                                redis_mgr.clear_cache("race_results_data")
-                                redis_mgr.clear_cache("cached_pb_leaderboard")
-                                st.cache_data.clear()
+                                update_race_result(r, result_id, updated_entry)
                                 st.success("Race result updated")
                                 st.session_state[edit_key] = False
                                 time.sleep(1)
@@ -798,6 +898,42 @@ def render_racelog_tab():
 # ============================================================
 # SECTION 11: TAB 5 - CHAMPIONSHIP (COMPLETE FROM 4_Championship.py)
 # ============================================================
+def build_champ_entries(p: Dict, m_info: Dict, race_idx: int, champ_calendar: List[Dict], season: str,
+                        pts: float, age_mode: str, pb_dist: Optional[str] = None) -> Tuple[Dict, Optional[Dict]]:
+    """Build the championship entry (and optional PB entry) for an approved submission in season"""
+    # Race 15 (Any Marathon) keeps the submitted date; undated entries fall on the season's first day
+    default_date = f"{season}-01-01"
+    if race_idx == 14:
+        final_date = p.get('date', default_date)
+    else:
+        final_date = champ_calendar[race_idx].get('date', default_date)
+    
+    cat = get_category(m_info.get('dob', '2000-01-01'), final_date, 
+                     "5Y" if "5" in age_mode else "10Y")
+    
+    champ_entry = {
+        "name": p['name'], 
+        "race_name": p.get('race_name', champ_calendar[race_idx].get('name', 'Unknown')),
+        "date": final_date,
+        "points": pts,
+        "category": cat,
+        "gender": m_info.get('gender', 'U')
+    }
+    
+    pb_entry = None
+    if pb_dist:
+        pb_entry = {
+            "name": p['name'],
+            "distance": pb_dist,
+            "location": p.get('race_name', 'Unknown'),
+            "race_date": final_date,
+            "time_display": p['time_display'],
+            "time_seconds": get_seconds(p['time_display']),
+            "gender": m_info.get('gender', 'U'),
+            "dob": m_info.get('dob', '2000-01-01')
+        }
+    return champ_entry, pb_entry
+
 def render_championship_tab():
     """Complete championship system from 4_Championship.py"""
     st.title("🏅 Championship Management")
@@ -807,14 +943,24 @@ def render_championship_tab():
         st.error("Redis connection unavailable")
         return
     
-    # Load essential data
-    raw_mems = r.lrange("members", 0, -1)
-    member_db = {json.loads(m)['name']: json.loads(m) for m in raw_mems}
+    # Each season has its own calendar, results and standings. Load them for
+    # the season picked on the last run (the current one at first) together
+    # with the season list, in one round trip.
+    season = st.session_state.get("champ_season_select")
+    snap = fetch_snapshot(r, "champ_seasons", "members", "club_settings", "champ_calendar", "champ_results",
+                          "champ_standings", "champ_pending_count", season=season)
+    current_season, seasons = snap["champ_seasons"]
+    seasons = [str(int(seasons[0]) + 1)] + seasons
+    if season is not None and season not in seasons:
+        del st.session_state["champ_season_select"]
+        st.rerun()
+    season = st.selectbox("Season", seasons, index=seasons.index(current_season), key="champ_season_select")
+    member_db = {m['name']: m for m in snap["members"]}
+    age_mode = snap["club_settings"].get('age_mode', '5 Year')
     
     # Get calendar
-    cal_raw = r.get("champ_calendar_2026")
-    if cal_raw:
-        champ_calendar = json.loads(cal_raw)
+    if snap["champ_calendar"] is not None:
+        champ_calendar = snap["champ_calendar"]
     else:
         # Create default calendar
         champ_calendar = []
@@ -822,7 +968,7 @@ def render_championship_tab():
             if i == 14:  # Race 15
                 champ_calendar.append({
                     "name": "Any Marathon (Power of 10)",
-                    "date": "Any 2026 Marathon",
+                    "date": f"Any {season} Marathon",
                     "distance": "Marathon",
                     "terrain": "Road"
                 })
@@ -847,14 +993,56 @@ def render_championship_tab():
         st.subheader("📥 Championship Submissions Pending Approval")
         
         # Load pending submissions
-        pending_raw = r.lrange("champ_pending", 0, -1)
-        pending = [json.loads(p) for p in pending_raw]
+        claimed = claim_submissions(r, CHAMP_QUEUE_KEY, get_queue_consumer())
         
-        if not pending:
+        if not claimed:
             st.info("No pending championship results.")
         else:
-            for i, p_raw in enumerate(pending):
-                p = json.loads(p_raw)
+            st.caption(f"{snap['champ_pending_count']} pending, {len(claimed)} claimed by this session")
+            pending = [(entry_id, json.loads(p_raw)) for entry_id, p_raw in claimed]
+            race_options = [f"Race {idx+1}: {rc.get('name')}" for idx, rc in enumerate(champ_calendar)]
+            
+            with st.expander("☑️ Bulk Actions (one race, one winner's time)"):
+                selected = st.multiselect(
+                    "Select submissions",
+                    range(len(pending)),
+                    format_func=lambda i: f"{pending[i][1]['name']} - {pending[i][1].get('race_name', 'Unknown')} ({pending[i][1]['time_display']})"
+                )
+                bulk_race = race_options.index(st.selectbox("Assign to Calendar Race", race_options, key="bulk_race"))
+                col1, col2 = st.columns(2)
+                bulk_win = col1.text_input("Winner's Time (HH:MM:SS)", "00:00:00", key="bulk_win")
+                bulk_log_pb = col2.checkbox("Also add to Main PB Leaderboard?", value=True, key="bulk_log_pb")
+                if bulk_race == 14:
+                    bulk_dist = "Marathon"
+                else:
+                    bulk_dist = st.selectbox("PB Category", ["5k", "10k", "10 Mile", "HM", "Marathon"], key="bulk_pb_dist")
+                
+                col1, col2 = st.columns(2)
+                if col1.button("✅ Approve Selected", disabled=not selected, use_container_width=True, type="primary"):
+                    winner_sec = get_seconds(bulk_win)
+                    items = []
+                    for idx in selected:
+                        entry_id, p = pending[idx]
+                        m_info = member_db.get(p['name'])
+                        if not m_info:
+                            continue
+                        runner_sec = get_seconds(p['time_display'])
+                        pts = round((winner_sec / runner_sec) * 100, 2) if winner_sec > 0 else 0.0
+                        items.append((entry_id, *build_champ_entries(
+                            p, m_info, bulk_race, champ_calendar, season, pts, age_mode,
+                            bulk_dist if bulk_log_pb else None
+                        )))
+                    approved = approve_champ_submissions(r, items, season)
+                    st.session_state['champ_bulk_msg'] = f"Approved {approved} of {len(selected)} selected (unknown members are skipped)"
+                    st.rerun()
+                if col2.button("❌ Reject Selected", disabled=not selected, use_container_width=True):
+                    rejected = reject_submissions(r, CHAMP_QUEUE_KEY, [pending[idx][0] for idx in selected])
+                    st.session_state['champ_bulk_msg'] = f"Rejected {rejected} submissions"
+                    st.rerun()
+                if 'champ_bulk_msg' in st.session_state:
+                    st.success(st.session_state.pop('champ_bulk_msg'))
+            
+            for i, (entry_id, p) in enumerate(pending):
                 with st.expander(f"Review: {p['name']} - {p.get('race_name', 'Unknown Race')}"):
                     st.write(f"**Submitted Time:** {p['time_display']}")
                     st.write(f"**Submitted Date/Location:** {p.get('date', 'Unknown')} / {p.get('race_name', 'Unknown')}")
@@ -864,7 +1052,6 @@ def render_championship_tab():
                         continue
                     
                     # Race selection
-                    race_options = [f"Race {idx+1}: {rc.get('name')}" for idx, rc in enumerate(champ_calendar)]
                     sel_race_str = st.selectbox("Assign to Calendar Race", race_options, key=f"conf_race_{i}")
                     race_idx = race_options.index(sel_race_str)
                     is_race_15 = (race_idx == 14)
@@ -901,56 +1088,16 @@ def render_championship_tab():
                             st.error(f"Member {p['name']} not found in database")
                             continue
                         
-                        # Determine date
-                        if is_race_15:
-                            final_date = p.get('date', '2026-01-01')
-                        else:
-                            final_date = champ_calendar[race_idx].get('date', '2026-01-01')
-                        
-                        # Calculate category
-                        settings_raw = r.get("club_settings")
-                        if settings_raw:
-                            settings = json.loads(settings_raw)
-                            age_mode = settings.get('age_mode', '5 Year')
-                        else:
-                            age_mode = '5 Year'
-                        
-                        cat = get_category(m_info.get('dob', '2000-01-01'), final_date, 
-                                         "5Y" if "5" in age_mode else "10Y")
-                        
-                        # Create championship entry
-                        champ_entry = {
-                            "name": p['name'], 
-                            "race_name": p.get('race_name', champ_calendar[race_idx].get('name', 'Unknown')),
-                            "date": final_date,
-                            "points": pts,
-                            "category": cat,
-                            "gender": m_info.get('gender', 'U')
-                        }
-                        
-                        # Save to championship results
-                        r.rpush("champ_results_final", json.dumps(champ_entry))
-                        
-                        # Optionally add to PB leaderboard
-                        if log_pb:
-                            pb_entry = {
-                                "name": p['name'],
-                                "distance": pb_dist,
-                                "location": p.get('race_name', 'Unknown'),
-                                "race_date": final_date,
-                                "time_display": p['time_display'],
-                                "time_seconds": runner_sec,
-                                "gender": m_info.get('gender', 'U'),
-                                "dob": m_info.get('dob', '2000-01-01')
-                            }
-                            r.rpush("race_results", json.dumps(pb_entry))
-                        
-                        # Rebuild caches
-                        rebuild_leaderboard_cache()
+                        champ_entry, pb_entry = build_champ_entries(
+                            p, m_info, race_idx, champ_calendar, season, pts, age_mode,
+                            pb_dist if log_pb else None
+                        )
                         
-                        # Remove from pending
-                        r.lset("champ_pending", i, "WIPE")
-                        r.lrem("champ_pending", 1, "WIPE")
+                        # Move out of pending and save in one transaction
+                        if not approve_champ_submission(r, entry_id, champ_entry, pb_entry, season):
+                            st.warning("This submission was already handled by another admin")
+                            time.sleep(2)
+                            st.rerun()
                         
                         st.success(f"Approved {p['name']}!")
                         time.sleep(2)
@@ -977,10 +1124,10 @@ def render_championship_tab():
                     name = c1.text_input("Name", "Any Marathon (Power of 10)", 
                                         key=f"n_{i}", disabled=True)
                     is_tbc = False
-                    date_val = "Any 2026 Marathon"
+                    date_val = f"Any {season} Marathon"
                     distance = "Marathon"
                     terrain = "Road"
-                    c2.info("Any 2026 Marathon")
+                    c2.info(f"Any {season} Marathon")
                     c3.info("Marathon")
                     c4.info("Road")
                 else:
@@ -999,9 +1146,9 @@ def render_championship_tab():
                     else:
                         # Try to parse existing date
                         try:
-                            d_val = datetime.strptime(race.get('date', '2026-01-01'), '%Y-%m-%d')
+                            d_val = datetime.strptime(race.get('date', f'{season}-01-01'), '%Y-%m-%d')
                         except:
-                            d_val = datetime(2026, 1, 1)
+                            d_val = datetime(int(season), 1, 1)
                         
                         date_val = c2.date_input("Date", d_val, key=f"d_{i}", label_visibility="collapsed")
                         distance = c3.selectbox("Distance", 
@@ -1026,22 +1173,28 @@ def render_championship_tab():
                 st.divider()
             
             if st.form_submit_button("💾 Save Calendar", type="primary"):
-                r.set("champ_calendar_2026", json.dumps(updated_cal))
+                save_champ_calendar(r, season, updated_cal)
                 rebuild_leaderboard_cache()
                 st.success("Calendar Saved and Cache Rebuilt!")
                 time.sleep(1)
                 st.rerun()
+        
+        if season != current_season:
+            if st.button(f"⭐ Make {season} the Current Season"):
+                set_champ_season(r, season)
+                st.success(f"New championship results now go into {season}")
+                time.sleep(1)
+                st.rerun()
     
     # ========== TAB 3: CHAMPIONSHIP LOG ==========
     with tab3:
         st.subheader("📊 Championship Results Log")
         
         # Load final results
-        final_raw = r.lrange("champ_results_final", 0, -1)
-        if not final_raw:
+        data = snap["champ_results"]
+        if not data:
             st.info("No championship results yet.")
         else:
-            data = [json.loads(x) for x in final_raw]
             df = pd.DataFrame(data)
             st.dataframe(df, use_container_width=True)
             
@@ -1061,9 +1214,10 @@ def render_championship_tab():
                             if st.form_submit_button("Save Changes"):
                                 result_to_edit['points'] = new_pts
                                 result_to_edit['category'] = new_cat
-                                r.lset("champ_results_final", int(idx), json.dumps(result_to_edit))
-                                rebuild_leaderboard_cache()
-                                st.success("Updated!")
+                                if update_champ_result(r, season, int(idx), result_to_edit):
+                                    st.success("Updated!")
+                                else:
+                                    st.warning("That result was changed by another admin")
                                 time.sleep(1)
                                 st.rerun()
             
@@ -1073,10 +1227,10 @@ def render_championship_tab():
                         del_idx = st.number_input("Index to Delete", 0, len(df)-1, 0, key="c_del_idx")
                         
                         if st.button("Confirm Deletion", type="secondary"):
-                            r.lset("champ_results_final", int(del_idx), "WIPE")
-                            r.lrem("champ_results_final", 1, "WIPE")
-                            rebuild_leaderboard_cache()
-                            st.success("Deleted!")
+                            if delete_champ_result(r, season, int(del_idx), data[del_idx].get('id')):
+                                st.success("Deleted!")
+                            else:
+                                st.warning("That result was changed by another admin")
                             time.sleep(1)
                             st.rerun()
     
@@ -1084,18 +1238,19 @@ def render_championship_tab():
     with tab4:
         st.subheader("🏆 Championship Standings")
         
-        # Try to get cached standings
-        cache = r.get("cached_champ_standings")
-        if cache:
-            try:
-                standings_df = pd.read_json(cache)
-                st.dataframe(standings_df, use_container_width=True)
-            except:
-                st.info("Standings cache corrupted. Rebuilding...")
-                cache = None
-        
-        if not cache:
-            st.info("Standings not yet generated. Approve some championship results first.")
+        # Standings are kept current on every write; a season is only built
+        # from scratch in the background the first time it is read
+        standings_df = get_champ_standings(r, snap["champ_standings"], season=season)
+        if standings_df is not None:
+            views = ["Overall", "Male", "Female"] + sorted(standings_df['category'].dropna().unique())
+            view = st.selectbox("Standings", views, key="champ_standings_view")
+            if view in ("Male", "Female"):
+                standings_df = get_champ_standings(r, season=season, gender=view)
+            elif view != "Overall":
+                standings_df = get_champ_standings(r, season=season, category=view)
+            st.dataframe(standings_df, use_container_width=True)
+        else:
+            st.info("Standings for this season are being built in the background; refresh shortly.")
 
 # ============================================================
 # SECTION 12: TAB 6 - SYSTEM TOOLS
@@ -1151,14 +1306,19 @@ def render_system_tab():
                     "age_mode": "5 Year" if "5" in age_mode else "10 Year"
                 }
                 
+                new_age_mode = "5Y" if "5" in age_mode else "10Y"
+                mode_changed = new_age_mode != get_age_mode()
                 r.set("club_settings", json.dumps(updated_settings))
-                r.set("age_mode", "5Y" if "5" in age_mode else "10Y")
+                r.set("age_mode", new_age_mode)
+                if mode_changed:
+                    with st.spinner("Recomputing stored age categories..."):
+                        recompute_categories(r, new_age_mode)
+                    request_leaderboard_rebuild(r, "pb")
                 if logo_url:
                     r.set("club_logo_url", logo_url)
                     r.set("logo_url", logo_url)
+                bump_generation(r, "settings")
                 
-                redis_mgr.clear_cache()
-                st.cache_data.clear()
                 st.success("Settings saved!")
                 time.sleep(1)
                 st.rerun()
@@ -1186,7 +1346,7 @@ def render_system_tab():
         
         with col2:
             if st.button("📥 Export Race Results", use_container_width=True):
-                results = load_race_results(redis_mgr)
+                results = load_race_results(redis_mgr) + get_archived_results(r)
                 if results:
                     export_data = []
                     for r in results:
@@ -1211,9 +1371,12 @@ def render_system_tab():
         
         with col3:
             if st.button("📥 Export Championship", use_container_width=True):
-                champ_raw = r.lrange("champ_results_final", 0, -1)
-                if champ_raw:
-                    champ_data = [json.loads(c) for c in champ_raw]
+                champ_data = [
+                    {"season": season, **row}
+                    for season, data in export_champ_seasons(r).items()
+                    for row in data["results"]
+                ]
+                if champ_data:
                     df = pd.DataFrame(champ_data)
                     csv = df.to_csv(index=False)
                     st.download_button(
@@ -1236,63 +1399,36 @@ def render_system_tab():
                                         type="csv")
         
         if uploaded_file is not None:
-            df = pd.read_csv(uploaded_file)
-            st.write(f"Preview ({len(df)} rows):")
-            st.dataframe(df.head(), use_container_width=True)
+            preview = pd.read_csv(uploaded_file, nrows=5)
+            st.write(f"Preview ({uploaded_file.size / 1024:.0f} KB file):")
+            st.dataframe(preview, use_container_width=True)
             
             if st.button("Import Data", type="primary"):
+                progress = st.progress(0.0, text="Importing...")
+                
+                def report(rows_read, imported, fraction):
+                    progress.progress(fraction or 0.0, text=f"Read {rows_read} rows, imported {imported}")
+                
                 if import_type == "Members CSV":
-                    imported = 0
-                    for _, row in df.iterrows():
-                        member_data = {
-                            "name": str(row.get('name', '')).strip(),
-                            "dob": str(row.get('dob', '2000-01-01')),
-                            "gender": str(row.get('gender', 'Male'))
-                        }
-                        if member_data['name']:
-                            r.rpush("members", json.dumps(member_data))
-                            imported += 1
-                    st.success(f"Imported {imported} members")
+                    rows_read, imported = import_csv(r, uploaded_file, import_members, on_progress=report)
+                    label = "members"
+                    request_leaderboard_rebuild(r, "leaders")
                 
                 elif import_type == "Race Results CSV":
-                    member_dict = get_member_dict()
-                    imported = 0
-                    for _, row in df.iterrows():
-                        name = str(row.get('name', '')).strip()
-                        if name in member_dict:
-                            member_info = member_dict[name]
-                            race_entry = {
-                                "name": name,
-                                "gender": member_info['gender'],
-                                "dob": member_info['dob'],
-                                "distance": str(row.get('distance', '5k')),
-                                "time_seconds": time_to_seconds(str(row.get('time_display', '00:00:00'))),
-                                "time_display": format_time_string(str(row.get('time_display', '00:00:00'))),
-                                "location": str(row.get('location', 'Unknown')),
-                                "race_date": str(row.get('race_date', '2026-01-01'))
-                            }
-                            r.rpush("race_results", json.dumps(race_entry))
-                            imported += 1
-                    st.success(f"Imported {imported} race results")
+                    rows_read, imported = import_csv(r, uploaded_file, import_race_results,
+                                                     on_progress=report, member_dict=get_member_dict())
+                    label = "race results"
+                    rebuild_leaderboard_cache()
                 
                 elif import_type == "Championship CSV":
-                    imported = 0
-                    for _, row in df.iterrows():
-                        champ_entry = {
-                            "name": str(row.get('name', '')).strip(),
-                            "race_name": str(row.get('race_name', 'Unknown')),
-                            "date": str(row.get('date', '2026-01-01')),
-                            "points": float(row.get('points', 0)),
-                            "category": str(row.get('category', 'Unknown')),
-                            "gender": str(row.get('gender', 'U'))
-                        }
-                        if champ_entry['name']:
-                            r.rpush("champ_results_final", json.dumps(champ_entry))
-                            imported += 1
-                    st.success(f"Imported {imported} championship results")
+                    rows_read, imported = import_csv(r, uploaded_file, import_champ_results, on_progress=report)
+                    label = "championship results"
+                
+                progress.progress(1.0, text="Import complete")
+                st.success(f"Imported {imported} {label}")
+                if rows_read > imported:
+                    st.warning(f"Skipped {rows_read - imported} rows (blank or unknown names)")
                 
-                redis_mgr.clear_cache()
-                st.cache_data.clear()
                 time.sleep(2)
                 st.rerun()
     
@@ -1304,28 +1440,64 @@ def render_system_tab():
         with col1:
             if st.button("🔄 Rebuild Leaderboard Cache", use_container_width=True):
                 with st.spinner("Rebuilding cache..."):
-                    if rebuild_leaderboard_cache():
+                    if rebuild_leaderboard_cache(wait=True):
                         st.success("Leaderboard cache rebuilt!")
                     else:
                         st.error("Cache rebuild failed")
+            
+            if st.button("🏷️ Recompute Age Categories", use_container_width=True):
+                with st.spinner("Recomputing categories..."):
+                    changed = recompute_categories(r, get_age_mode())
+                    if changed:
+                        rebuild_leaderboard_cache()
+                    st.success(f"Updated {changed} race results")
         
         with col2:
             if st.button("🧹 Clear Pending Submissions", use_container_width=True, type="secondary"):
-                r.delete("pending_results")
-                r.delete("champ_pending")
+                clear_submission_queues(r)
                 st.success("Pending submissions cleared!")
         
         st.divider()
         
+        st.subheader("🧊 Season Archive")
+        st.caption("Sealed seasons are stored compressed and read-only; they still count towards the leaderboards.")
+        archived = get_archived_seasons(r)
+        this_year = datetime.now().year
+        open_seasons = [s for s in get_result_seasons(r) if int(s) < this_year and s not in archived]
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            to_archive = st.selectbox("Finished season", open_seasons, key="archive_season") if open_seasons else None
+            if st.button("🧊 Archive Season", use_container_width=True, disabled=to_archive is None):
+                moved = archive_season(r, to_archive)
+                st.success(f"Archived {moved} results from {to_archive}")
+        with col2:
+            to_restore = st.selectbox("Archived season", list(archived), key="unarchive_season",
+                                      format_func=lambda s: f"{s} ({archived[s]} results)") if archived else None
+            if st.button("♻️ Unarchive Season", use_container_width=True, disabled=to_restore is None):
+                restored = unarchive_season(r, to_restore)
+                st.success(f"Restored {restored} results from {to_restore}")
+        
+        st.divider()
+        
+        st.subheader("📈 Process Cache")
+        stats = redis_mgr.cache_stats()
+        lookups = stats["hits"] + stats["misses"]
+        c1, c2, c3, c4 = st.columns(4)
+        c1.metric("Hit Rate", f"{stats['hits'] / lookups:.0%}" if lookups else "n/a")
+        c2.metric("Hits / Misses", f"{stats['hits']} / {stats['misses']}")
+        c3.metric("Evictions", stats["evictions"], help=f"{stats['expired']} entries expired by TTL")
+        c4.metric("Entries", stats["entries"], help=f"{stats['bytes'] / 1024:.0f} KB of {RedisManager.CACHE_MAX_BYTES // (1024 * 1024)} MB budget")
+        
+        st.divider()
+        
         with st.expander("⚠️ Danger Zone", expanded=False):
             st.warning("These actions cannot be undone!")
             
             if st.button("🗑️ Clear All Race Results", type="secondary"):
                 if st.checkbox("I understand this will delete ALL race results"):
-                    r.delete("race_results")
-                    r.delete("cached_pb_leaderboard")
-                    redis_mgr.clear_cache()
-                    st.cache_data.clear()
+                    clear_race_results(r)
+                    request_leaderboard_rebuild(r, "pb")
                     st.error("All race results deleted!")
                     time.sleep(2)
                     st.rerun()
@@ -1336,10 +1508,9 @@ def render_system_tab():
                     password = r.get("admin_password")
                     keys = r.keys("*")
                     for key in keys:
-                        if key not in ["club_settings", "admin_password", "club_logo_url", "logo_url", "age_mode"]:
+                        if key not in ["club_settings", "admin_password", "club_logo_url", "logo_url", "age_mode", GENERATIONS_KEY]:
                             r.delete(key)
-                    redis_mgr.clear_cache()
-                    st.cache_data.clear()
+                    bump_generation(r, "members", "results", "champ")
                     st.error("System reset complete!")
                     time.sleep(2)
                     st.rerun()
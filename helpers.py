@@ -1,8 +1,19 @@
 import streamlit as st
 import redis
+try:
+    from redis.cache import CacheConfig
+except ImportError:  # redis-py < 5.1 has no client-side caching
+    CacheConfig = None
 import json
+import zlib
+import base64
 import pandas as pd
+import numpy as np
 import os
+import uuid
+import time
+import threading
+import logging
 from datetime import datetime
 
 def get_redis():
@@ -10,9 +21,27 @@ def get_redis():
     redis_url = os.environ.get("REDIS_URL")
     return redis.from_url(redis_url, decode_responses=True)
 
+@st.cache_resource
+def get_cached_redis():
+    """
+    Shared read client with server-assisted client-side caching (RESP3
+    CLIENT TRACKING): repeat reads are served locally until Redis pushes an
+    invalidation. Falls back to a plain client if RESP3 is unavailable.
+    Only for simple reads, never inside WATCH transactions.
+    """
+    if CacheConfig is None:
+        return get_redis()
+    try:
+        r = redis.from_url(os.environ.get("REDIS_URL"), decode_responses=True,
+                           protocol=3, cache_config=CacheConfig(max_size=1000))
+        r.ping()
+        return r
+    except Exception:
+        return get_redis()
+
 def get_club_settings():
     """Retrieve club-wide settings."""
-    r = get_redis()
+    r = get_cached_redis()
     s = r.get("club_settings")
     if s:
         return json.loads(s)
@@ -43,37 +72,1583 @@ def get_category(dob_str, race_date_str, age_mode="Age on Day"):
     except:
         return "SEN"
 
+def get_categories(dobs, race_dates, age_mode="Age on Day"):
+    """
+    Vectorised category calculation for aligned sequences of DOBs and race
+    dates. Matches the scalar rules: "5Y" and "10Y" as used by the admin app
+    (Senior/V35/V40... or Senior/V40/V50...), anything else the Age on Day
+    bands of get_category (SEN/V40/V45...V70+). Returns a Series.
+    """
+    index = dobs.index if isinstance(dobs, pd.Series) else None
+    dob = pd.to_datetime(pd.Series(list(dobs), dtype=object).astype(str), format='%Y-%m-%d', errors='coerce')
+    ref = pd.to_datetime(pd.Series(list(race_dates), dtype=object).astype(str), format='%Y-%m-%d', errors='coerce')
+    before_birthday = (ref.dt.month * 100 + ref.dt.day) < (dob.dt.month * 100 + dob.dt.day)
+    age = (ref.dt.year - dob.dt.year - before_birthday.astype(int)).to_numpy(dtype=float)
+    known = ~np.isnan(age)
+    age = np.where(known, age, 0).astype(int)
+
+    if age_mode in ("5Y", "10Y"):
+        threshold, step = (35, 5) if age_mode == "5Y" else (40, 10)
+        vets = np.char.add("V", (age // step * step).astype(str))
+        cats = np.where(age < threshold, "Senior", vets)
+        cats = np.where(known, cats, "Unknown")
+    else:
+        vets = np.char.add("V", (np.minimum(age, 69) // 5 * 5).astype(str))
+        cats = np.where(age < 40, "SEN", np.where(age >= 70, "V70+", vets))
+        cats = np.where(known, cats, "SEN")
+
+    return pd.Series(cats, index=index, dtype=object)
+
+# --- DATASET GENERATIONS ---
+# One counter per dataset in the dataset_generations hash, bumped by every
+# write. Process-local caches key their entries on the current generation,
+# so a write in any process invalidates exactly the dataset it touched.
+GENERATIONS_KEY = "dataset_generations"
+DATASETS = ("members", "results", "champ", "settings")
+
+def get_generations(r):
+    """Current generation of every dataset, in one round trip."""
+    values = r.hmget(GENERATIONS_KEY, *DATASETS)
+    return {d: int(v or 0) for d, v in zip(DATASETS, values)}
+
+def bump_generation(r, *datasets):
+    """Mark datasets as changed (r may be a client or an open pipeline)."""
+    for d in datasets:
+        r.hincrby(GENERATIONS_KEY, d, 1)
+
+# --- RACE RESULTS STORAGE ---
+# Results live in a hash keyed by a stable ID so edits and deletes never
+# depend on list positions. The old "race_results" list is only read by the
+# migration below.
+RESULTS_KEY = "race_results_by_id"
+RESULTS_SEQ_KEY = "race_results_seq"
+LEGACY_RESULTS_KEY = "race_results"
+
+# Date-ordered indexes (score = YYYYMMDD), one overall and one per distance,
+# so the race log can fetch a single page newest-first.
+RESULTS_BY_DATE_KEY = "race_results_by_date"
+
+# PB index: one sorted set per season/distance/gender/5-year age band, scored
+# by time_seconds. Every category scheme (5Y, 10Y, Age on Day) is a union of
+# these bands, so leaders for any scheme are the fastest head across its bands.
+PB_INDEX_KEY = "pb_index"
+RESULT_SEASONS_KEY = "race_results_per_season"
+RESULTS_INDEX_VERSION_KEY = "race_results_index_version"
+RESULTS_INDEX_VERSION = "3"
+DISTANCES = ["5k", "10k", "10 Mile", "HM", "Marathon"]
+GENDERS = ["Male", "Female"]
+AGE_BANDS = ["U35"] + [str(a) for a in range(35, 105, 5)] + ["X"]
+
+# Per-member index: the set of result IDs for each runner, plus a count per
+# name so searches can list names without scanning the keyspace.
+MEMBER_RESULTS_KEY = "member_results"
+MEMBER_RESULT_COUNTS_KEY = "member_result_counts"
+
+# Each result stores its category under the club age mode; this records the
+# mode the stored categories were computed with.
+CATEGORY_MODE_KEY = "race_results_category_mode"
+
+def _date_score(race_date):
+    try:
+        d = datetime.strptime(str(race_date), '%Y-%m-%d')
+        return d.year * 10000 + d.month * 100 + d.day
+    except:
+        return 0
+
+def _age_band(dob_str, race_date_str):
+    try:
+        dob = datetime.strptime(str(dob_str), '%Y-%m-%d')
+        ref_date = datetime.strptime(str(race_date_str), '%Y-%m-%d')
+        age = ref_date.year - dob.year - ((ref_date.month, ref_date.day) < (dob.month, dob.day))
+    except:
+        return "X"
+    if age < 35:
+        return "U35"
+    return str(min(age // 5 * 5, 100))
+
+def band_category(band, age_mode="Age on Day"):
+    """Map a 5-year age band to its category under the given age mode."""
+    if band == "X":
+        return "Unknown" if age_mode in ("5Y", "10Y") else "SEN"
+    age = 0 if band == "U35" else int(band)
+    if age_mode == "5Y":
+        return "Senior" if age < 35 else f"V{age}"
+    if age_mode == "10Y":
+        return "Senior" if age < 40 else f"V{age // 10 * 10}"
+    if age < 40:
+        return "SEN"
+    return "V70+" if age >= 70 else f"V{age}"
+
+def _pb_key(season, distance, gender, band):
+    return f"{PB_INDEX_KEY}:{season}:{distance}:{gender}:{band}"
+
+def _pb_keys(entry):
+    band = _age_band(entry.get('dob'), entry.get('race_date'))
+    season = str(entry.get('race_date', ''))[:4]
+    return [_pb_key(s, entry.get('distance'), entry.get('gender'), band) for s in ("All-Time", season)]
+
+def _index_result(pipe, rid, entry):
+    score = _date_score(entry.get('race_date'))
+    pipe.zadd(RESULTS_BY_DATE_KEY, {rid: score})
+    pipe.zadd(f"{RESULTS_BY_DATE_KEY}:{entry.get('distance')}", {rid: score})
+    for key in _pb_keys(entry):
+        pipe.zadd(key, {rid: entry.get('time_seconds', 999999)})
+    pipe.hincrby(RESULT_SEASONS_KEY, str(entry.get('race_date', ''))[:4], 1)
+    pipe.sadd(f"{MEMBER_RESULTS_KEY}:{entry.get('name')}", rid)
+    pipe.hincrby(MEMBER_RESULT_COUNTS_KEY, str(entry.get('name')), 1)
+
+def _unindex_result(pipe, rid, entry):
+    pipe.zrem(RESULTS_BY_DATE_KEY, rid)
+    pipe.zrem(f"{RESULTS_BY_DATE_KEY}:{entry.get('distance')}", rid)
+    for key in _pb_keys(entry):
+        pipe.zrem(key, rid)
+    pipe.hincrby(RESULT_SEASONS_KEY, str(entry.get('race_date', ''))[:4], -1)
+    pipe.srem(f"{MEMBER_RESULTS_KEY}:{entry.get('name')}", rid)
+    pipe.hincrby(MEMBER_RESULT_COUNTS_KEY, str(entry.get('name')), -1)
+
+def migrate_race_results(r):
+    """Move any entries left in the legacy race_results list into the keyed hash."""
+    if not r.exists(LEGACY_RESULTS_KEY):
+        return 0
+
+    def _move(pipe):
+        raw = pipe.lrange(LEGACY_RESULTS_KEY, 0, -1)
+        if not raw:
+            return 0
+        start = int(pipe.get(RESULTS_SEQ_KEY) or 0)
+        age_mode = get_club_age_mode(pipe)
+        entries = [json.loads(res) for res in raw]
+        cats = get_categories([e.get('dob') for e in entries], [e.get('race_date') for e in entries], age_mode)
+        for entry, cat in zip(entries, cats):
+            entry['category'] = cat
+        pipe.multi()
+        pipe.hset(RESULTS_KEY, mapping={str(start + i + 1): _encode_result(e) for i, e in enumerate(entries)})
+        for i, entry in enumerate(entries):
+            _index_result(pipe, str(start + i + 1), entry)
+        pipe.set(RESULTS_SEQ_KEY, start + len(raw))
+        pipe.delete(LEGACY_RESULTS_KEY)
+        return len(raw)
+
+    return r.transaction(_move, LEGACY_RESULTS_KEY, RESULTS_SEQ_KEY, value_from_callable=True)
+
+def _decode_result(rid, raw):
+    res = json.loads(raw)
+    res['id'] = str(rid)
+    return res
+
+def _encode_result(entry):
+    return json.dumps({k: v for k, v in entry.items() if k != 'id'})
+
+def _fetch_results(r, ids):
+    if not ids:
+        return []
+    raw = r.hmget(RESULTS_KEY, ids)
+    return [_decode_result(rid, res) for rid, res in zip(ids, raw) if res]
+
+def get_race_results(r):
+    """All race results in insertion order, each carrying its stable 'id'."""
+    migrate_race_results(r)
+    raw = r.hgetall(RESULTS_KEY)
+    return [_decode_result(rid, raw[rid]) for rid in sorted(raw, key=int)]
+
+def count_race_results(r):
+    """Number of stored race results."""
+    migrate_race_results(r)
+    return r.hlen(RESULTS_KEY)
+
+def get_club_age_mode(r):
+    """Club age category mode set in the admin System settings ("5Y" or "10Y")."""
+    stored = r.get("age_mode") or "5 Year"
+    return "5Y" if "5" in stored else "10Y"
+
+def _set_category(entry, age_mode):
+    entry['category'] = get_categories([entry.get('dob')], [entry.get('race_date')], age_mode).iloc[0]
+    return entry
+
+def update_race_result(r, rid, entry, age_mode=None):
+    """Overwrite an existing race result and patch the leaders cache. Returns False if it was deleted meanwhile."""
+    rid = str(rid)
+    _set_category(entry, age_mode or get_club_age_mode(r))
+
+    def _update(pipe):
+        raw = pipe.hget(RESULTS_KEY, rid)
+        if raw is None:
+            return None
+        old = _decode_result(rid, raw)
+        pipe.multi()
+        pipe.hset(RESULTS_KEY, rid, _encode_result(entry))
+        _unindex_result(pipe, rid, old)
+        _index_result(pipe, rid, entry)
+        bump_generation(pipe, "results")
+        return old
+
+    old = r.transaction(_update, RESULTS_KEY, value_from_callable=True)
+    if old is None:
+        return False
+    patch_pb_leaders(r, [old, entry])
+    return True
+
+def delete_race_result(r, rid):
+    """Remove a race result by ID and patch the leaders cache. Returns False if it was already gone."""
+    rid = str(rid)
+
+    def _delete(pipe):
+        raw = pipe.hget(RESULTS_KEY, rid)
+        if raw is None:
+            return None
+        old = _decode_result(rid, raw)
+        pipe.multi()
+        pipe.hdel(RESULTS_KEY, rid)
+        _unindex_result(pipe, rid, old)
+        bump_generation(pipe, "results")
+        return old
+
+    old = r.transaction(_delete, RESULTS_KEY, value_from_callable=True)
+    if old is None:
+        return False
+    patch_pb_leaders(r, [old])
+    return True
+
+def _results_index_keys(r):
+    keys = list(r.scan_iter(match=f"{RESULTS_BY_DATE_KEY}*"))
+    keys += list(r.scan_iter(match=f"{PB_INDEX_KEY}:*"))
+    keys += list(r.scan_iter(match=f"{MEMBER_RESULTS_KEY}:*"))
+    return keys + [RESULT_SEASONS_KEY, MEMBER_RESULT_COUNTS_KEY]
+
+def clear_race_results(r):
+    """Drop every race result, archived or not, and its indexes (IDs are never reused)."""
+    pipe = r.pipeline()
+    pipe.delete(RESULTS_KEY, LEGACY_RESULTS_KEY, *ARCHIVE_KEYS, *_results_index_keys(r))
+    bump_generation(pipe, "results")
+    pipe.execute()
+
+def rebuild_results_index(r):
+    """Recreate the date and PB indexes from the results hash."""
+    results = get_race_results(r)
+    pipe = r.pipeline()
+    for key in _results_index_keys(r):
+        pipe.delete(key)
+    for res in results:
+        _index_result(pipe, res['id'], res)
+    pipe.set(RESULTS_INDEX_VERSION_KEY, RESULTS_INDEX_VERSION)
+    pipe.execute()
+
+def ensure_results_index(r):
+    """Backfill the indexes and stored categories if they are missing or out of date."""
+    pipe = r.pipeline(transaction=False)
+    pipe.get(RESULTS_INDEX_VERSION_KEY)
+    pipe.zcard(RESULTS_BY_DATE_KEY)
+    pipe.hlen(RESULTS_KEY)
+    pipe.get(CATEGORY_MODE_KEY)
+    pipe.get("age_mode")
+    version, indexed, total, category_mode, stored_mode = pipe.execute()
+    if version != RESULTS_INDEX_VERSION or indexed != total:
+        rebuild_results_index(r)
+    club_mode = "5Y" if "5" in (stored_mode or "5 Year") else "10Y"
+    if category_mode != club_mode:
+        recompute_categories(r, club_mode)
+
+def _rewrite_results(pipe, pairs):
+    """Queue storing each (old, new) result pair and moving its index entries."""
+    for old, new in pairs:
+        pipe.hset(RESULTS_KEY, old['id'], _encode_result(new))
+        _unindex_result(pipe, old['id'], old)
+        _index_result(pipe, old['id'], new)
+    bump_generation(pipe, "results")
+
+CATEGORY_BATCH_SIZE = 1000
+
+def recompute_categories(r, age_mode=None, batch_size=CATEGORY_BATCH_SIZE):
+    """
+    Re-materialise every stored category after the club age mode changes.
+    Returns the number of rewritten results.
+    """
+    age_mode = age_mode or get_club_age_mode(r)
+    migrate_race_results(r)
+    ids = sorted(r.hkeys(RESULTS_KEY), key=int)
+    changed = 0
+    for start in range(0, len(ids), batch_size):
+        batch = ids[start:start + batch_size]
+
+        # Each batch is re-read under WATCH: rows deleted meanwhile are
+        # skipped and rows edited meanwhile are recomputed from the edit
+        def _rewrite(pipe):
+            results = _fetch_results(pipe, batch)
+            if not results:
+                return 0
+            cats = get_categories([res.get('dob') for res in results], [res.get('race_date') for res in results], age_mode)
+            stale = {res['id']: _encode_result({**res, 'category': cat})
+                     for res, cat in zip(results, cats) if res.get('category') != cat}
+            if not stale:
+                return 0
+            pipe.multi()
+            pipe.hset(RESULTS_KEY, mapping=stale)
+            bump_generation(pipe, "results")
+            return len(stale)
+
+        changed += r.transaction(_rewrite, RESULTS_KEY, value_from_callable=True)
+    r.set(CATEGORY_MODE_KEY, age_mode)
+    return changed
+
+def update_member_results(r, name, new_name=None, dob=None, gender=None):
+    """
+    Copy a member's edited name/DOB/gender onto their stored results,
+    recomputing categories and index entries for just those results.
+    Returns the number of rewritten results.
+    """
+    ensure_results_index(r)
+    age_mode = get_club_age_mode(r)
+    member_key = f"{MEMBER_RESULTS_KEY}:{name}"
+
+    # Rows are read under WATCH so a concurrent edit or delete retries the
+    # rewrite instead of being overwritten or brought back
+    def _update(pipe):
+        pairs = []
+        for old in _fetch_results(pipe, list(pipe.smembers(member_key))):
+            new = {**old}
+            if new_name is not None:
+                new['name'] = new_name
+            if dob is not None:
+                new['dob'] = dob
+            if gender is not None:
+                new['gender'] = gender
+            if new != old:
+                pairs.append((old, new))
+        if not pairs:
+            return 0
+
+        new_results = [new for _, new in pairs]
+        cats = get_categories([n.get('dob') for n in new_results], [n.get('race_date') for n in new_results], age_mode)
+        for new, cat in zip(new_results, cats):
+            new['category'] = cat
+        pipe.multi()
+        _rewrite_results(pipe, pairs)
+        return len(pairs)
+
+    return r.transaction(_update, RESULTS_KEY, member_key, value_from_callable=True)
+
+def get_race_results_page(r, page=1, per_page=25, distance=None, name=None):
+    """One page of race results, newest first, plus the total number of matches."""
+    migrate_race_results(r)
+    ensure_results_index(r)
+    key = f"{RESULTS_BY_DATE_KEY}:{distance}" if distance else RESULTS_BY_DATE_KEY
+    start = (page - 1) * per_page
+
+    if not name:
+        ids = r.zrevrange(key, start, start + per_page - 1)
+        return _fetch_results(r, ids), r.zcard(key)
+
+    # Name search is a substring match over runner names; the per-member
+    # index turns matching names into result IDs, ordered via the date index
+    needle = name.lower()
+    counts = r.hgetall(MEMBER_RESULT_COUNTS_KEY)
+    names = [n for n, c in counts.items() if int(c) > 0 and needle in n.lower()]
+    if not names:
+        return [], 0
+    ids = list(r.sunion([f"{MEMBER_RESULTS_KEY}:{n}" for n in names]))
+    scores = r.zmscore(key, ids) if ids else []
+    ranked = sorted(((sc, rid) for rid, sc in zip(ids, scores) if sc is not None), reverse=True)
+    return _fetch_results(r, [rid for _, rid in ranked[start:start + per_page]]), len(ranked)
+
+def get_result_seasons(r):
+    """Seasons (years) that have at least one live or archived result, newest first."""
+    ensure_results_index(r)
+    pipe = r.pipeline(transaction=False)
+    pipe.hgetall(RESULT_SEASONS_KEY)
+    pipe.hkeys(ARCHIVE_COUNTS_KEY)
+    counts, archived = pipe.execute()
+    live = {s for s, n in counts.items() if s.isdigit() and int(n) > 0}
+    return sorted(live | set(archived), reverse=True)
+
+def count_season_results(r, season="All-Time"):
+    """Number of live and archived results in a season, or in total for All-Time."""
+    pipe = r.pipeline(transaction=False)
+    if season == "All-Time":
+        pipe.hlen(RESULTS_KEY)
+        pipe.hvals(ARCHIVE_COUNTS_KEY)
+        live, archived = pipe.execute()
+        return live + sum(int(n) for n in archived)
+    pipe.hget(RESULT_SEASONS_KEY, str(season))
+    pipe.hget(ARCHIVE_COUNTS_KEY, str(season))
+    return sum(int(n or 0) for n in pipe.execute())
+
+def _pb_band_heads(r, seasons, slots=None):
+    """Fastest (rid, seconds) per season, distance, gender and age band (only in slots, if given)."""
+    combos = [(s, d, g, b) for s in seasons for d in DISTANCES for g in GENDERS for b in AGE_BANDS
+              if slots is None or (s, d, g) in slots]
+    pipe = r.pipeline(transaction=False)
+    for combo in combos:
+        pipe.zrange(_pb_key(*combo), 0, 0, withscores=True)
+    return {combo: head[0] for combo, head in zip(combos, pipe.execute()) if head}
+
+def _category_leaders(heads, season, age_mode):
+    best = {}
+    for (s, d, g, b), (rid, secs) in heads.items():
+        if s != season:
+            continue
+        slot = (d, g, band_category(b, age_mode))
+        if slot not in best or secs < best[slot][1]:
+            best[slot] = (rid, secs)
+    return best
+
+def _band_leaders(r, seasons, slots=None):
+    """
+    Band heads for seasons across the PB index and archived seasons'
+    leaders, plus {rid: result} for every head. slots optionally limits
+    them to a set of (season, distance, gender).
+    """
+    heads = _pb_band_heads(r, seasons, slots)
+    archived = {}
+    for season, raw in r.hgetall(ARCHIVE_LEADERS_KEY).items():
+        for band_key, row in json.loads(raw).items():
+            d, g, b = band_key.split("|")
+            secs = float(row.get('time_seconds') or 999999)
+            for s in (season, "All-Time"):
+                combo = (s, d, g, b)
+                if slots is not None and (s, d, g) not in slots:
+                    continue
+                if s in seasons and d in DISTANCES and g in GENDERS and (combo not in heads or secs < heads[combo][1]):
+                    heads[combo] = (row['id'], secs)
+                    archived[row['id']] = row
+    live_ids = list({rid for rid, _ in heads.values() if rid not in archived})
+    records = {res['id']: res for res in _fetch_results(r, live_ids)}
+    records.update(archived)
+    return heads, records
+
+def get_pb_leaders(r, season="All-Time", age_mode="Age on Day"):
+    """Fastest result per distance, gender and category, read from the PB index and the archive."""
+    ensure_results_index(r)
+    heads, records = _band_leaders(r, [season])
+    best = _category_leaders(heads, season, age_mode)
+    return [
+        {**records[rid], 'Category': cat}
+        for (d, g, cat), (rid, _) in best.items() if rid in records
+    ]
+
+# --- COLD ARCHIVE ---
+# A past season can be sealed into one compressed blob in
+# race_results_archive, with its fastest result per distance/gender/age
+# band alongside in race_results_archive_leaders. Its
+# rows then leave the results hash and every index, so rebuilds and the
+# race log only touch live seasons. Leaderboards merge the small leaders
+# payload; the blob itself is only decoded when the season's rows are
+# asked for. Archived rows are read-only: member renames and category
+# recomputes skip them until the season is unarchived.
+RESULTS_ARCHIVE_KEY = "race_results_archive"
+ARCHIVE_LEADERS_KEY = "race_results_archive_leaders"
+ARCHIVE_COUNTS_KEY = "race_results_archive_counts"
+ARCHIVE_KEYS = (RESULTS_ARCHIVE_KEY, ARCHIVE_LEADERS_KEY, ARCHIVE_COUNTS_KEY)
+
+# Archive blob format: "PBL1:" + base64(zlib(JSON)). The JSON is columnar;
+# repetitive columns (name, distance, location...) are dictionary-encoded
+# as a value list plus integer codes (code -1 for missing). Base64 keeps
+# the blob valid for the decode_responses connections.
+ARCHIVE_FORMAT = "PBL1"
+
+def _encode_archive(rows):
+    """Encode {rid: row} as a race_results_archive blob."""
+    ids = list(rows)
+    names = sorted({k for row in rows.values() for k in row})
+    columns = {}
+    for col in names:
+        values = [rows[rid].get(col) for rid in ids]
+        uniques = [v for v in dict.fromkeys(values) if v is not None]
+        if len(uniques) * 2 <= len(values):
+            codes = {v: i for i, v in enumerate(uniques)}
+            columns[col] = {"dict": uniques, "codes": [codes.get(v, -1) for v in values]}
+        else:
+            columns[col] = {"values": values}
+    body = json.dumps({"ids": ids, "columns": columns}, separators=(',', ':'))
+    return f"{ARCHIVE_FORMAT}:" + base64.b64encode(zlib.compress(body.encode(), 6)).decode('ascii')
+
+def _decode_archive(raw):
+    """(ids, columns) from an archive blob, or None if it is missing or unreadable."""
+    if not raw or not raw.startswith(f"{ARCHIVE_FORMAT}:"):
+        return None
+    try:
+        data = json.loads(zlib.decompress(base64.b64decode(raw[len(ARCHIVE_FORMAT) + 1:])))
+    except (ValueError, zlib.error):
+        return None
+    return data['ids'], data['columns']
+
+def _archive_rows(raw):
+    decoded = _decode_archive(raw)
+    if decoded is None:
+        return None
+    ids, columns = decoded
+    values = {col: spec['values'] if 'values' in spec else [spec['dict'][c] if c >= 0 else None for c in spec['codes']]
+              for col, spec in columns.items()}
+    return {rid: {col: vals[i] for col, vals in values.items() if vals[i] is not None}
+            for i, rid in enumerate(ids)}
+
+def _archive_leader_rows(rows):
+    best = {}
+    for rid, row in rows.items():
+        band_key = "|".join([str(row.get('distance')), str(row.get('gender')),
+                             _age_band(row.get('dob'), row.get('race_date'))])
+        secs = float(row.get('time_seconds') or 999999)
+        if band_key not in best or secs < float(best[band_key]['time_seconds'] or 999999):
+            best[band_key] = {**{col: row.get(col) for col in LEADER_COLUMNS}, 'id': rid}
+    return best
+
+def get_archived_seasons(r):
+    """{season: result count} for every archived season."""
+    return {s: int(n) for s, n in r.hgetall(ARCHIVE_COUNTS_KEY).items()}
+
+def archive_season(r, season):
+    """
+    Seal a finished season's results into the archive (merging with any
+    earlier archive of it). Returns the number of results moved.
+    """
+    season = str(season)
+    if not season.isdigit() or int(season) >= datetime.now().year:
+        raise ValueError(f"Season {season} is not over yet")
+    ensure_results_index(r)
+    first_day = int(season) * 10000
+
+    def _seal(pipe):
+        ids = pipe.zrangebyscore(RESULTS_BY_DATE_KEY, first_day, first_day + 9999)
+        entries = [_decode_result(rid, raw) for rid, raw in zip(ids, pipe.hmget(RESULTS_KEY, ids) if ids else []) if raw]
+        if not entries:
+            return 0
+        rows = _archive_rows(pipe.hget(RESULTS_ARCHIVE_KEY, season)) or {}
+        rows.update({e['id']: {k: v for k, v in e.items() if k != 'id'} for e in entries})
+        pipe.multi()
+        pipe.hset(RESULTS_ARCHIVE_KEY, season, _encode_archive(rows))
+        pipe.hset(ARCHIVE_LEADERS_KEY, season, json.dumps(_archive_leader_rows(rows)))
+        pipe.hset(ARCHIVE_COUNTS_KEY, season, len(rows))
+        pipe.hdel(RESULTS_KEY, *[e['id'] for e in entries])
+        for e in entries:
+            _unindex_result(pipe, e['id'], e)
+        bump_generation(pipe, "results")
+        return len(entries)
+
+    moved = r.transaction(_seal, RESULTS_KEY, RESULTS_ARCHIVE_KEY, value_from_callable=True)
+    if moved:
+        request_leaderboard_rebuild(r, "pb")
+    return moved
+
+def get_archived_results(r, season=None):
+    """Rows of one archived season (or every one), decoded from the archive blob."""
+    if season is None:
+        blobs = r.hgetall(RESULTS_ARCHIVE_KEY)
+    else:
+        blobs = {str(season): r.hget(RESULTS_ARCHIVE_KEY, str(season))}
+    results = []
+    for blob in blobs.values():
+        rows = _archive_rows(blob) or {}
+        results.extend({**row, 'id': rid} for rid, row in rows.items())
+    return results
+
+def unarchive_season(r, season):
+    """Move an archived season back into the live results so it can be edited. Returns the number restored."""
+    season = str(season)
+
+    def _restore(pipe):
+        rows = _archive_rows(pipe.hget(RESULTS_ARCHIVE_KEY, season))
+        if not rows:
+            return 0
+        pipe.multi()
+        pipe.hset(RESULTS_KEY, mapping={rid: _encode_result(row) for rid, row in rows.items()})
+        for rid, row in rows.items():
+            _index_result(pipe, rid, row)
+        for key in ARCHIVE_KEYS:
+            pipe.hdel(key, season)
+        bump_generation(pipe, "results")
+        return len(rows)
+
+    restored = r.transaction(_restore, RESULTS_ARCHIVE_KEY, value_from_callable=True)
+    if restored:
+        request_leaderboard_rebuild(r, "pb")
+    return restored
+
+# --- CHAMPIONSHIP SEASONS ---
+# Championship entries and calendars are kept per season in
+# champ_results:{season} and champ_calendar:{season}. champ_seasons lists
+# the seasons that exist and champ_season names the one being run. Race
+# results need no copies: the date and PB indexes already partition them by
+# season, and their All-Time entries are updated on every write.
+CHAMP_SEASON_KEY = "champ_season"
+CHAMP_SEASONS_KEY = "champ_seasons"
+LEGACY_CHAMP_RESULTS_KEY = "champ_results_final"
+LEGACY_CHAMP_CALENDAR_KEY = "champ_calendar_2026"
+LEGACY_CHAMP_SEASON = "2026"
+
+def champ_results_key(season):
+    return f"champ_results:{season}"
+
+def champ_calendar_key(season):
+    return f"champ_calendar:{season}"
+
+def migrate_champ_seasons(r):
+    """Move the unpartitioned champ_results_final list and champ_calendar_2026 into the 2026 season."""
+    if not r.exists(LEGACY_CHAMP_RESULTS_KEY, LEGACY_CHAMP_CALENDAR_KEY):
+        return 0
+
+    def _move(pipe):
+        raw = pipe.lrange(LEGACY_CHAMP_RESULTS_KEY, 0, -1)
+        calendar = pipe.get(LEGACY_CHAMP_CALENDAR_KEY)
+        pipe.multi()
+        if raw:
+            pipe.rpush(champ_results_key(LEGACY_CHAMP_SEASON), *raw)
+        if calendar is not None:
+            pipe.set(champ_calendar_key(LEGACY_CHAMP_SEASON), calendar, nx=True)
+        pipe.delete(LEGACY_CHAMP_RESULTS_KEY, LEGACY_CHAMP_CALENDAR_KEY)
+        pipe.sadd(CHAMP_SEASONS_KEY, LEGACY_CHAMP_SEASON)
+        pipe.set(CHAMP_SEASON_KEY, LEGACY_CHAMP_SEASON, nx=True)
+        bump_generation(pipe, "champ")
+        return len(raw)
+
+    return r.transaction(_move, LEGACY_CHAMP_RESULTS_KEY, LEGACY_CHAMP_CALENDAR_KEY, value_from_callable=True)
+
+def get_champ_season(r):
+    """Championship season currently being run (this year until one is set)."""
+    pipe = r.pipeline(transaction=False)
+    pipe.exists(LEGACY_CHAMP_RESULTS_KEY, LEGACY_CHAMP_CALENDAR_KEY)
+    pipe.get(CHAMP_SEASON_KEY)
+    legacy, season = pipe.execute()
+    if legacy:
+        migrate_champ_seasons(r)
+        season = r.get(CHAMP_SEASON_KEY)
+    return season or str(datetime.now().year)
+
+def set_champ_season(r, season):
+    """Make season the one new championship results go into."""
+    pipe = r.pipeline()
+    pipe.set(CHAMP_SEASON_KEY, str(season))
+    pipe.sadd(CHAMP_SEASONS_KEY, str(season))
+    bump_generation(pipe, "champ")
+    pipe.execute()
+
+def get_champ_seasons(r):
+    """Seasons with championship data, plus the current one, newest first."""
+    current = get_champ_season(r)
+    return sorted(r.smembers(CHAMP_SEASONS_KEY) | {current}, reverse=True)
+
+def save_champ_calendar(r, season, calendar):
+    """Store a season's 15-race calendar."""
+    pipe = r.pipeline()
+    pipe.set(champ_calendar_key(season), json.dumps(calendar))
+    pipe.sadd(CHAMP_SEASONS_KEY, str(season))
+    bump_generation(pipe, "champ")
+    pipe.execute()
+
+def export_champ_seasons(r):
+    """{season: {"results": [...], "calendar": [...]}} for every championship season."""
+    seasons = get_champ_seasons(r)
+    pipe = r.pipeline()
+    for season in seasons:
+        pipe.lrange(champ_results_key(season), 0, -1)
+        pipe.get(champ_calendar_key(season))
+    replies = pipe.execute()
+    return {
+        season: {"results": _json_list(raw), "calendar": json.loads(cal) if cal else []}
+        for season, raw, cal in zip(seasons, replies[::2], replies[1::2])
+    }
+
+def clear_champ_seasons(r):
+    """Delete every season's championship results and calendar."""
+    seasons = get_champ_seasons(r)
+    pipe = r.pipeline()
+    for season in seasons:
+        pipe.delete(champ_results_key(season), champ_calendar_key(season))
+    # Standings may also exist for seasons that were only looked at
+    pipe.delete(CHAMP_SEASONS_KEY, *r.scan_iter(match=f"{CHAMP_STANDINGS_KEY}:*"))
+    bump_generation(pipe, "champ")
+    pipe.execute()
+
+# --- CHAMPIONSHIP STANDINGS ---
+# Standings are maintained per season as entries are written rather than
+# recomputed from the whole list:
+#   champ_standings:{season}:points:{name}    ZSET entry id -> points
+#   champ_standings:{season}:entries          HASH entry id -> name/category/gender
+#   champ_standings:{season}:runners          HASH name -> standings row
+#   champ_standings:{season}:board            ZSET name -> total (overall)
+#   champ_standings:{season}:gender:{g}       ZSET name -> total
+#   champ_standings:{season}:category:{c}     ZSET name -> total
+# A runner's total is the sum of the top CHAMP_BEST_OF scores in their
+# points set, so each write costs a few O(log n) sorted-set operations.
+# Category and gender come from their best-scoring entry. The full rebuild
+# also gives entries that predate entry IDs one, and marks the season built.
+CHAMP_STANDINGS_KEY = "champ_standings"
+LEGACY_STANDINGS_KEY = "cached_champ_standings"
+CHAMP_SEQ_KEY = "champ_results_seq"
+CHAMP_BEST_OF = 6
+STANDINGS_COLUMNS = ['Name', 'category', 'gender', 'Races Run', 'Total Points']
+
+def _standings_key(season, *parts):
+    return ":".join([CHAMP_STANDINGS_KEY, str(season), *map(str, parts)])
+
+def _standings_keys(r, season):
+    return list(r.scan_iter(match=_standings_key(season, "*")))
+
+def _standings_board(season, gender=None, category=None):
+    if gender:
+        return _standings_key(season, "gender", gender)
+    if category:
+        return _standings_key(season, "category", category)
+    return _standings_key(season, "board")
+
+def _standing_row(name, top, info):
+    return {"Name": name, "category": info.get('category'), "gender": info.get('gender'),
+            "Races Run": len(top), "Total Points": round(sum(score for _, score in top), 2)}
+
+def _queue_standing(pipe, season, name, row, old=None):
+    if old:
+        pipe.zrem(_standings_board(season, gender=old['gender']), name)
+        pipe.zrem(_standings_board(season, category=old['category']), name)
+    if row is None:
+        pipe.hdel(_standings_key(season, "runners"), name)
+        pipe.zrem(_standings_board(season), name)
+        return
+    pipe.hset(_standings_key(season, "runners"), name, json.dumps(row))
+    for board in (_standings_board(season), _standings_board(season, gender=row['gender']),
+                  _standings_board(season, category=row['category'])):
+        pipe.zadd(board, {name: row['Total Points']})
+
+def _assign_champ_ids(r, entries):
+    if entries:
+        last = r.incrby(CHAMP_SEQ_KEY, len(entries))
+        for n, entry in enumerate(entries):
+            entry['id'] = str(last - len(entries) + 1 + n)
+    return entries
+
+def _queue_champ_entry(pipe, season, entry):
+    pipe.zadd(_standings_key(season, "points", entry['name']), {entry['id']: float(entry.get('points') or 0)})
+    pipe.hset(_standings_key(season, "entries"), entry['id'], json.dumps(
+        {"name": entry['name'], "category": entry.get('category'), "gender": entry.get('gender')}))
+
+def _unqueue_champ_entry(pipe, season, entry):
+    pipe.zrem(_standings_key(season, "points", entry['name']), entry['id'])
+    pipe.hdel(_standings_key(season, "entries"), entry['id'])
+
+def _runner_keys(season, entries):
+    """Keys to WATCH while the standings of the runners in entries are recomputed."""
+    return [_standings_key(season, "runners")] + sorted({_standings_key(season, "points", e['name']) for e in entries})
+
+def _runner_updates(r, season, added=(), removed=()):
+    """
+    [(name, new row or None, current row)] for every runner in added or
+    removed, as their standings will be once those entries are written.
+    Two pipelined reads whatever the number of runners; call it with
+    _runner_keys() watched and queue the rows in the same MULTI.
+    """
+    names = sorted({e['name'] for e in (*added, *removed)})
+    if not names:
+        return []
+    gone = {e['id'] for e in removed}
+    fresh = {e['id']: e for e in added}
+    pipe = r.pipeline(transaction=False)
+    for name in names:
+        pipe.zrevrange(_standings_key(season, "points", name), 0, CHAMP_BEST_OF - 1 + len(gone), withscores=True)
+    pipe.hmget(_standings_key(season, "runners"), names)
+    *tops, olds = pipe.execute()
+
+    best_of = {}
+    for name, top in zip(names, tops):
+        scores = {rid: score for rid, score in top if rid not in gone}
+        scores.update({e['id']: float(e.get('points') or 0) for e in added if e['name'] == name})
+        # Same order as ZREVRANGE: points, then ID, descending
+        best_of[name] = sorted(scores.items(), key=lambda item: (item[1], item[0]), reverse=True)[:CHAMP_BEST_OF]
+    need = [top[0][0] for top in best_of.values() if top and top[0][0] not in fresh]
+    stored = dict(zip(need, r.hmget(_standings_key(season, "entries"), need))) if need else {}
+
+    updates = []
+    for name, old in zip(names, olds):
+        top, row = best_of[name], None
+        if top:
+            info = fresh.get(top[0][0]) or json.loads(stored.get(top[0][0]) or '{}')
+            row = _standing_row(name, top, info)
+        updates.append((name, row, json.loads(old) if old else None))
+    return updates
+
+def rebuild_season_standings(r, season):
+    """Rebuild a season's standings from its results list, giving any entry without an ID one."""
+    season = str(season)
+    results_key = champ_results_key(season)
+    stale_keys = _standings_keys(r, season)
+
+    def _rebuild(pipe):
+        entries = _json_list(pipe.lrange(results_key, 0, -1))
+        missing = [e for e in entries if 'id' not in e]
+        if missing:
+            last = pipe.incrby(CHAMP_SEQ_KEY, len(missing))
+            for n, entry in enumerate(missing):
+                entry['id'] = str(last - len(missing) + 1 + n)
+        by_name = {}
+        for entry in entries:
+            by_name.setdefault(entry['name'], []).append(entry)
+        pipe.multi()
+        if missing:
+            pipe.delete(results_key)
+            pipe.rpush(results_key, *[json.dumps(e) for e in entries])
+        if stale_keys:
+            pipe.delete(*stale_keys)
+        for name, runs in by_name.items():
+            for entry in runs:
+                _queue_champ_entry(pipe, season, entry)
+            # Same order as ZREVRANGE: points, then ID, descending
+            best = sorted(runs, key=lambda e: (float(e.get('points') or 0), e['id']), reverse=True)[:CHAMP_BEST_OF]
+            top = [(e['id'], float(e.get('points') or 0)) for e in best]
+            _queue_standing(pipe, season, name, _standing_row(name, top, best[0]))
+        pipe.set(_standings_key(season, "built"), 1)
+        return len(entries)
+
+    return r.transaction(_rebuild, results_key, value_from_callable=True)
+
+def rebuild_champ_standings(r, season=None):
+    """Rebuild one season's standings, or every season's, from scratch (best 6 results per runner)."""
+    if season is not None:
+        return rebuild_season_standings(r, season)
+    r.delete(LEGACY_STANDINGS_KEY)
+    return _single_flight(r, CHAMP_STANDINGS_KEY, lambda r: [rebuild_season_standings(r, s) for s in get_champ_seasons(r)])
+
+def _queue_standings_read(pipe, season, gender=None, category=None):
+    pipe.zrevrange(_standings_board(season, gender, category), 0, -1)
+    pipe.hgetall(_standings_key(season, "runners"))
+    pipe.exists(_standings_key(season, "built"))
+
+def get_champ_standings(r, prefetched=None, season=None, gender=None, category=None):
+    """
+    Standings for a season (the current one by default) as a DataFrame,
+    overall or for one gender or category; None until the season's
+    standings have been built, which is then queued for that season.
+    prefetched is the "champ_standings" entry of a fetch_snapshot() call
+    for season.
+    """
+    season = str(season or get_champ_season(r))
+    if prefetched is None:
+        pipe = r.pipeline(transaction=False)
+        _queue_standings_read(pipe, season, gender, category)
+        prefetched = pipe.execute()
+    ranked, runners, built = prefetched
+    if not built:
+        request_leaderboard_rebuild(r, f"champ:{season}")
+        return None
+    return pd.DataFrame([json.loads(runners[name]) for name in ranked if name in runners], columns=STANDINGS_COLUMNS)
+
+def update_champ_result(r, season, index, entry):
+    """Replace the championship entry at index and update standings. Returns False if the entry there has changed."""
+    season = str(season)
+    results_key = champ_results_key(season)
+
+    def _update(pipe):
+        current = pipe.lindex(results_key, index)
+        old = json.loads(current) if current else None
+        if old is None or old.get('id') != entry.get('id'):
+            return False
+        standings = []
+        if 'id' in entry:
+            pipe.watch(*_runner_keys(season, [old, entry]))
+            standings = _runner_updates(r, season, added=[entry], removed=[old])
+        pipe.multi()
+        pipe.lset(results_key, index, json.dumps(entry))
+        if 'id' in entry:
+            _unqueue_champ_entry(pipe, season, old)
+            _queue_champ_entry(pipe, season, entry)
+        for name, row, old_row in standings:
+            _queue_standing(pipe, season, name, row, old_row)
+        bump_generation(pipe, "champ")
+        return True
+
+    updated = r.transaction(_update, results_key, value_from_callable=True)
+    if updated and 'id' not in entry:
+        request_leaderboard_rebuild(r, "champ")
+    return updated
+
+def delete_champ_result(r, season, index, entry_id=None):
+    """Delete the championship entry at index (if it is still entry_id) and update standings. Returns True if deleted."""
+    season = str(season)
+    results_key = champ_results_key(season)
+
+    def _delete(pipe):
+        current = pipe.lindex(results_key, index)
+        old = json.loads(current) if current else None
+        if old is None or old.get('id') != entry_id:
+            return False
+        standings = []
+        if entry_id is not None:
+            pipe.watch(*_runner_keys(season, [old]))
+            standings = _runner_updates(r, season, removed=[old])
+        pipe.multi()
+        pipe.lset(results_key, index, "WIPE")
+        pipe.lrem(results_key, 1, "WIPE")
+        if entry_id is not None:
+            _unqueue_champ_entry(pipe, season, old)
+        for name, row, old_row in standings:
+            _queue_standing(pipe, season, name, row, old_row)
+        bump_generation(pipe, "champ")
+        return True
+
+    deleted = r.transaction(_delete, results_key, value_from_callable=True)
+    if deleted and entry_id is None:
+        request_leaderboard_rebuild(r, "champ")
+    return deleted
+
+# --- BULK IMPORT ---
+# CSV imports are normalised column-wise and written in pipelined batches,
+# one round trip per batch rather than one per row.
+IMPORT_BATCH_SIZE = 1000
+IMPORT_CHUNK_ROWS = 5000
+_INT_PART = r'\s*[+-]?\d+\s*'
+
+def _text_column(df, col, default):
+    if col not in df:
+        return pd.Series(default, index=df.index, dtype=object)
+    return df[col].astype(object).map(str).astype(object)
+
+def times_to_seconds(times):
+    """Vectorised time_to_seconds: H:M:S, M:S or S strings to seconds (999999 if invalid)."""
+    index = times.index if isinstance(times, pd.Series) else None
+    s = pd.Series(list(times), dtype=object).map(str)
+    parts = s.str.split(':', expand=True).reindex(columns=range(3)).fillna('')
+    n_parts = s.str.count(':') + 1
+    nums = [pd.to_numeric(parts[i].where(parts[i].str.fullmatch(_INT_PART) == True), errors='coerce')
+            for i in range(3)]
+    secs = np.select(
+        [n_parts == 3, n_parts == 2, n_parts == 1],
+        [nums[0] * 3600 + nums[1] * 60 + nums[2], nums[0] * 60 + nums[1], nums[0]],
+        default=np.nan
+    )
+    return pd.Series(np.where(np.isnan(secs), 999999, secs).astype(int), index=index)
+
+def format_time_strings(times):
+    """Vectorised format_time_string: pad M:S / H:M:S to HH:MM:SS."""
+    index = times.index if isinstance(times, pd.Series) else None
+    s = pd.Series(list(times), dtype=object).map(str).str.strip()
+    parts = s.str.split(':', expand=True).reindex(columns=range(3)).fillna('')
+    z = [parts[i].str.zfill(2) for i in range(3)]
+    n_parts = s.str.count(':') + 1
+    out = np.select(
+        [n_parts == 2, n_parts == 3],
+        ["00:" + z[0] + ":" + z[1], z[0] + ":" + z[1] + ":" + z[2]],
+        default="00:00:00"
+    )
+    return pd.Series(out, index=index, dtype=object)
+
+def _write_results(r, entries, batch_size=IMPORT_BATCH_SIZE):
+    if not entries:
+        return 0
+    last = r.incrby(RESULTS_SEQ_KEY, len(entries))
+    first = last - len(entries) + 1
+    for start in range(0, len(entries), batch_size):
+        batch = {str(first + start + i): e for i, e in enumerate(entries[start:start + batch_size])}
+        pipe = r.pipeline()
+        pipe.hset(RESULTS_KEY, mapping={rid: _encode_result(e) for rid, e in batch.items()})
+        for rid, e in batch.items():
+            _index_result(pipe, rid, e)
+        pipe.execute()
+    bump_generation(r, "results")
+    return len(entries)
+
+def import_race_results(r, df, member_dict=None, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Normalise and store a results DataFrame. With member_dict, rows for
+    unknown names are skipped and gender/dob come from the member record;
+    otherwise they are read from the CSV. Returns the number imported.
+    """
+    ensure_results_index(r)
+    names = _text_column(df, 'name', '').str.strip()
+    if member_dict is not None:
+        keep = names.isin(list(member_dict))
+        df, names = df[keep], names[keep]
+        genders = names.map(lambda n: member_dict[n].get('gender', 'U'))
+        dobs = names.map(lambda n: member_dict[n].get('dob', '2000-01-01'))
+    else:
+        keep = names != ''
+        df, names = df[keep], names[keep]
+        genders = _text_column(df, 'gender', 'U')
+        dobs = _text_column(df, 'dob', '2000-01-01')
+    if df.empty:
+        return 0
+
+    raw_times = _text_column(df, 'time_display', '00:00:00')
+    seconds = times_to_seconds(raw_times)
+    if 'time_seconds' in df:
+        given = pd.to_numeric(df['time_seconds'], errors='coerce')
+        seconds = pd.Series(np.where(given.notna(), given.fillna(0), seconds.values).astype(int), index=df.index)
+    race_dates = _text_column(df, 'race_date', '2026-01-01')
+
+    columns = {
+        "name": names.tolist(),
+        "gender": genders.tolist(),
+        "dob": dobs.tolist(),
+        "distance": _text_column(df, 'distance', '5k').tolist(),
+        "time_seconds": [int(x) for x in seconds],
+        "time_display": format_time_strings(raw_times).tolist(),
+        "location": _text_column(df, 'location', 'Unknown').tolist(),
+        "race_date": race_dates.tolist(),
+        "category": get_categories(dobs, race_dates, get_club_age_mode(r)).tolist(),
+    }
+    entries = [dict(zip(columns, row)) for row in zip(*columns.values())]
+    return _write_results(r, entries, batch_size)
+
+def import_members(r, df, batch_size=IMPORT_BATCH_SIZE):
+    """Append members from a DataFrame (name, dob, gender[, status]). Returns the number imported."""
+    names = _text_column(df, 'name', '').str.strip()
+    keep = names != ''
+    columns = {
+        "name": names[keep].tolist(),
+        "dob": _text_column(df, 'dob', '2000-01-01')[keep].tolist(),
+        "gender": _text_column(df, 'gender', 'Male')[keep].tolist(),
+    }
+    if 'status' in df:
+        columns["status"] = _text_column(df, 'status', 'Active')[keep].tolist()
+    rows = [json.dumps(dict(zip(columns, row))) for row in zip(*columns.values())]
+    pipe = r.pipeline()
+    for start in range(0, len(rows), batch_size):
+        pipe.rpush("members", *rows[start:start + batch_size])
+    if rows:
+        bump_generation(pipe, "members")
+    pipe.execute()
+    return len(rows)
+
+def import_champ_results(r, df, batch_size=IMPORT_BATCH_SIZE, season=None):
+    """Append championship results from a DataFrame to a season (the current one by default). Returns the number imported."""
+    season = str(season or get_champ_season(r))
+    names = _text_column(df, 'name', '').str.strip()
+    keep = names != ''
+    points = pd.to_numeric(df['points'], errors='coerce').fillna(0) if 'points' in df else pd.Series(0.0, index=df.index)
+    columns = {
+        "name": names[keep].tolist(),
+        "race_name": _text_column(df, 'race_name', 'Unknown')[keep].tolist(),
+        "date": _text_column(df, 'date', f'{season}-01-01')[keep].tolist(),
+        "points": [float(p) for p in points[keep]],
+        "category": _text_column(df, 'category', 'Unknown')[keep].tolist(),
+        "gender": _text_column(df, 'gender', 'U')[keep].tolist(),
+    }
+    entries = _assign_champ_ids(r, [dict(zip(columns, row)) for row in zip(*columns.values())])
+    for start in range(0, len(entries), batch_size):
+        batch = entries[start:start + batch_size]
+
+        # Each batch lands together with its runners' standings rows
+        def _append(pipe):
+            standings = _runner_updates(r, season, added=batch)
+            pipe.multi()
+            pipe.rpush(champ_results_key(season), *[json.dumps(e) for e in batch])
+            for entry in batch:
+                _queue_champ_entry(pipe, season, entry)
+            for name, row, old in standings:
+                _queue_standing(pipe, season, name, row, old)
+
+        r.transaction(_append, *_runner_keys(season, batch))
+    if entries:
+        pipe = r.pipeline()
+        pipe.sadd(CHAMP_SEASONS_KEY, season)
+        bump_generation(pipe, "champ")
+        pipe.execute()
+    return len(entries)
+
+def import_csv(r, source, importer, chunksize=IMPORT_CHUNK_ROWS, on_progress=None, **kwargs):
+    """
+    Stream a CSV through one of the import_* functions a chunk at a time so
+    memory stays bounded by chunksize. on_progress(rows_read, imported,
+    fraction) is called after each chunk; fraction is None when the source
+    size is unknown. Returns (rows_read, imported).
+    """
+    size = getattr(source, 'size', None)
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    rows_read = imported = 0
+    for chunk in pd.read_csv(source, chunksize=chunksize):
+        rows_read += len(chunk)
+        imported += importer(r, chunk, **kwargs)
+        if on_progress:
+            fraction = min(source.tell() / size, 1.0) if size and hasattr(source, 'tell') else None
+            on_progress(rows_read, imported, fraction)
+    return rows_read, imported
+
+# --- LEADERBOARD CACHES ---
+# The old cached_pb_leaderboard full-row snapshot is retired: nothing read
+# it, and leaderboards are served from cached_pb_leaders. The next "pb"
+# rebuild deletes any copy left behind.
+LEGACY_PB_SNAPSHOT_KEY = "cached_pb_leaderboard"
+# cached_pb_leaders holds only what the leaderboards show: one hash field
+# per season (plus All-Time), each a JSON map of age mode to leader rows
+# that already carry their Category and the runner's active flag.
+PB_LEADERS_KEY = "cached_pb_leaders"
+LEADER_AGE_MODES = ("Age on Day", "5Y", "10Y")
+LEADER_COLUMNS = ('id', 'name', 'gender', 'distance', 'time_seconds', 'time_display', 'location', 'race_date')
+
+# Every published cache records a generation (bumped whenever its payload
+# changes) and a build time in leaderboard_cache_meta. Readers serve
+# whatever was last published and only queue a background rebuild when it
+# is missing or older than CACHE_MAX_STALE_SECONDS
+# (LEADERBOARD_MAX_STALE_SECONDS in the environment). Process-local caches
+# key decoded payloads on the generation.
+CACHE_META_KEY = "leaderboard_cache_meta"
+CACHE_MAX_STALE_SECONDS = int(os.environ.get("LEADERBOARD_MAX_STALE_SECONDS", 900))
+
+def _publish_cache(pipe, key, payload):
+    if isinstance(payload, dict):
+        pipe.delete(key)
+        if payload:
+            pipe.hset(key, mapping=payload)
+    else:
+        pipe.set(key, payload)
+    pipe.hincrby(CACHE_META_KEY, f"{key}:generation", 1)
+    pipe.hset(CACHE_META_KEY, f"{key}:built_at", time.time())
+
+def get_cache_generation(r, key):
+    """Generation of a published cache (0 until it is first built)."""
+    return int(r.hget(CACHE_META_KEY, f"{key}:generation") or 0)
+
+def read_cache(r, key, part, max_stale=CACHE_MAX_STALE_SECONDS, field=None):
+    """
+    Stale-while-revalidate read of a published cache (one field of it for
+    hash caches). Returns the payload (None if never built) and queues a
+    rebuild of part if the copy is missing or too old; never rebuilds inline.
+    """
+    pipe = r.pipeline(transaction=False)
+    _queue_cache_read(pipe, key, field)
+    return _finish_cache_read(r, part, pipe.execute(), max_stale)
+
+def _queue_cache_read(pipe, key, field=None):
+    if field is None:
+        pipe.get(key)
+    else:
+        pipe.hget(key, field)
+    pipe.hget(CACHE_META_KEY, f"{key}:built_at")
+    pipe.llen(REBUILD_QUEUE_KEY)
+
+def _finish_cache_read(r, part, replies, max_stale=CACHE_MAX_STALE_SECONDS):
+    payload, built_at, queued = replies
+    age = time.time() - float(built_at) if built_at else None
+    if payload is None or age is None or age > max_stale:
+        if queued:
+            start_rebuild_worker(r)
+        else:
+            request_leaderboard_rebuild(r, part)
+    return payload
+
+# Full rebuilds run under a SET NX PX lease lock so that only one process
+# rebuilds a cache at a time. Anyone who asks while a rebuild is running
+# sets a rerun flag, which makes the holder go round once more before
+# releasing, and then waits for the lock to clear.
+REBUILD_LEASE_MS = 30000
+REBUILD_WAIT_SECONDS = 10
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+def _single_flight(r, name, build, wait=True):
+    """Run build(r) while holding {name}:lock, or wait for whoever holds it."""
+    lock_key, rerun_key = f"{name}:lock", f"{name}:rerun"
+    token = uuid.uuid4().hex
+    built, result = False, None
+    while r.set(lock_key, token, nx=True, px=REBUILD_LEASE_MS):
+        try:
+            r.delete(rerun_key)
+            result, built = build(r), True
+        finally:
+            r.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+        if not r.exists(rerun_key):
+            return result
+    if not built:
+        r.set(rerun_key, 1, px=REBUILD_LEASE_MS)
+    if wait:
+        deadline = time.monotonic() + REBUILD_WAIT_SECONDS
+        while r.exists(lock_key) and time.monotonic() < deadline:
+            time.sleep(0.1)
+    return result
+
+def rebuild_pb_leaders(r):
+    """Rebuild cached_pb_leaders from the PB index and the member list."""
+    return _single_flight(r, PB_LEADERS_KEY, _build_pb_leaders)
+
+def _leader_row(res, category, active_names):
+    row = {col: res.get(col) for col in LEADER_COLUMNS}
+    row['Category'] = category
+    row['active'] = res.get('name') in active_names
+    return row
+
+def _active_names(r):
+    return {m['name'] for m in _json_list(r.lrange("members", 0, -1)) if m.get('status', 'Active') == 'Active'}
+
+def _build_pb_leaders(r):
+    ensure_results_index(r)
+    seasons = ["All-Time"] + get_result_seasons(r)
+    heads, records = _band_leaders(r, seasons)
+    active_names = _active_names(r)
+    payload = {}
+    for season in seasons:
+        payload[season] = json.dumps({
+            mode: [_leader_row(records[rid], cat, active_names)
+                   for (d, g, cat), (rid, _) in _category_leaders(heads, season, mode).items() if rid in records]
+            for mode in LEADER_AGE_MODES
+        })
+    pipe = r.pipeline()
+    _publish_cache(pipe, PB_LEADERS_KEY, payload)
+    pipe.execute()
+    return len(seasons)
+
+def _leader_slots(entries):
+    """(season, distance, gender) leaderboard slots that any of entries fall in."""
+    return {(s, e.get('distance'), e.get('gender'))
+            for e in entries if e.get('distance') in DISTANCES and e.get('gender') in GENDERS
+            for s in ("All-Time", str(e.get('race_date', ''))[:4])}
+
+def patch_pb_leaders(r, entries):
+    """
+    Apply added, changed or removed results to cached_pb_leaders. entries
+    holds every version involved (old and new); only the season, distance
+    and gender slots they fall in are recomputed from the PB index heads.
+    Falls back to queueing a full "leaders" rebuild when a season's field
+    is missing or unreadable, and tells a rebuild already running to go
+    round again rather than racing it.
+    """
+    slots = _leader_slots(entries)
+    if not slots:
+        return
+    seasons = sorted({s for s, _, _ in slots})
+    lock_key = f"{PB_LEADERS_KEY}:lock"
+
+    def _patch(pipe):
+        if pipe.exists(lock_key):
+            pipe.multi()
+            pipe.set(f"{PB_LEADERS_KEY}:rerun", 1, px=REBUILD_LEASE_MS)
+            return True
+        try:
+            payloads = {s: json.loads(raw) for s, raw in zip(seasons, pipe.hmget(PB_LEADERS_KEY, seasons))}
+        except (TypeError, ValueError):
+            return False
+        # Read the index through r once WATCH is set: a write landing after
+        # these reads touches cached_pb_leaders with its own patch, so this
+        # one is retried rather than publishing stale heads
+        heads, records = _band_leaders(r, seasons, slots)
+        active_names = _active_names(r)
+        for season, payload in payloads.items():
+            touched = {(d, g) for s, d, g in slots if s == season}
+            for mode in LEADER_AGE_MODES:
+                rows = [row for row in payload.get(mode, []) if (row.get('distance'), row.get('gender')) not in touched]
+                rows += [_leader_row(records[rid], cat, active_names)
+                         for (d, g, cat), (rid, _) in _category_leaders(heads, season, mode).items() if rid in records]
+                payload[mode] = rows
+        pipe.multi()
+        pipe.hset(PB_LEADERS_KEY, mapping={s: json.dumps(p) for s, p in payloads.items()})
+        pipe.hincrby(CACHE_META_KEY, f"{PB_LEADERS_KEY}:generation", 1)
+        return True
+
+    if not r.transaction(_patch, PB_LEADERS_KEY, lock_key, value_from_callable=True):
+        request_leaderboard_rebuild(r, "leaders")
+
+def get_leaderboard(r, season="All-Time", age_mode="Age on Day"):
+    """
+    Precomputed leaders for a season (or All-Time) under an age mode, each
+    row carrying Category and active; never waits on a rebuild. Until the
+    cache is published the leaders are read straight from the PB index.
+    """
+    raw = read_cache(r, PB_LEADERS_KEY, "leaders", field=str(season))
+    if raw:
+        try:
+            return json.loads(raw)[age_mode]
+        except (ValueError, KeyError):
+            request_leaderboard_rebuild(r, "leaders")
+    active_names = _active_names(r)
+    return [{**row, 'active': row['name'] in active_names} for row in get_pb_leaders(r, season, age_mode)]
+
+def rebuild_pb_caches(r):
+    """Rebuild cached_pb_leaders after results change, dropping the retired snapshot."""
+    pipe = r.pipeline()
+    pipe.delete(LEGACY_PB_SNAPSHOT_KEY)
+    pipe.hdel(CACHE_META_KEY, f"{LEGACY_PB_SNAPSHOT_KEY}:generation", f"{LEGACY_PB_SNAPSHOT_KEY}:built_at")
+    pipe.execute()
+    rebuild_pb_leaders(r)
+
 def rebuild_leaderboard_cache(r):
     """Calculates and caches the PB Leaderboard and Championship Standings."""
-    # 1. PB LEADERBOARD CACHE
-    raw_res = r.lrange("race_results", 0, -1)
-    if raw_res:
-        df = pd.DataFrame([json.loads(res) for res in raw_res])
-        r.set("cached_pb_leaderboard", df.to_json())
-    
-    # 2. CHAMPIONSHIP STANDINGS CACHE
-    champ_raw = r.lrange("champ_results_final", 0, -1)
-    if champ_raw:
-        c_df = pd.DataFrame([json.loads(x) for x in champ_raw])
-        c_df = c_df.sort_values(['name', 'points'], ascending=[True, False])
-        
-        # Take top 6 results
-        top_6 = c_df.groupby('name').head(6)
-        
-        standings = top_6.groupby('name').agg({
-            'points': 'sum',
-            'race_name': 'count'
-        }).reset_index()
-        
-        standings.columns = ['Name', 'Total Points', 'Races Run']
-        
-        # Merge back category and gender (latest)
-        latest_info = c_df.drop_duplicates('name', keep='first')[['name', 'category', 'gender']]
-        standings = standings.merge(latest_info, left_on='Name', right_on='name').drop('name', axis=1)
-        
-        standings = standings[['Name', 'category', 'gender', 'Races Run', 'Total Points']]
-        standings = standings.sort_values('Total Points', ascending=False)
-        
-        r.set("cached_champ_standings", standings.to_json())
-    
+    rebuild_pb_caches(r)
+    rebuild_champ_standings(r)
     return True
+
+# --- BACKGROUND REBUILDS ---
+# Write paths queue a rebuild request instead of rebuilding inline. One
+# worker thread per process blocks on the request list; after a short
+# debounce it drains every queued request, so a burst of writes (from any
+# process) costs a single rebuild.
+# A part that raises is logged and requeued after an exponential backoff,
+# without holding up the other parts; after REBUILD_MAX_ATTEMPTS failures
+# in a row it is dropped until something requests it again.
+REBUILD_QUEUE_KEY = "leaderboard_rebuild_requests"
+REBUILD_DEBOUNCE_SECONDS = 1.0
+REBUILD_RETRY_SECONDS = 5
+REBUILD_MAX_BACKOFF_SECONDS = 300
+REBUILD_MAX_ATTEMPTS = 5
+REBUILD_PARTS = {"pb": rebuild_pb_caches, "leaders": rebuild_pb_leaders, "champ": rebuild_champ_standings}
+_rebuild_worker = None
+_rebuild_worker_lock = threading.Lock()
+log = logging.getLogger(__name__)
+
+def request_leaderboard_rebuild(r, part="all"):
+    """
+    Queue a rebuild of "pb", "leaders", "champ" (or "champ:<season>" for
+    one season) or "all" caches and return immediately.
+    """
+    r.rpush(REBUILD_QUEUE_KEY, part)
+    start_rebuild_worker(r)
+
+def _drain_rebuild_requests(r, first):
+    pipe = r.pipeline()
+    pipe.lrange(REBUILD_QUEUE_KEY, 0, -1)
+    pipe.delete(REBUILD_QUEUE_KEY)
+    parts = {p for p in (first, *pipe.execute()[0]) if p == "all" or p.partition(":")[0] in REBUILD_PARTS}
+    if "all" in parts:
+        parts = set(REBUILD_PARTS) | {p for p in parts if ":" in p}
+    if "pb" in parts:
+        parts.discard("leaders")
+    return parts
+
+def _run_rebuild_parts(r, parts, failures):
+    """Run each part, returning the ones that failed and should be retried."""
+    retry = []
+    for part in sorted(parts):
+        name, _, arg = part.partition(":")
+        try:
+            REBUILD_PARTS[name](r, arg) if arg else REBUILD_PARTS[name](r)
+            failures.pop(part, None)
+        except Exception:
+            failures[part] = failures.get(part, 0) + 1
+            if failures[part] < REBUILD_MAX_ATTEMPTS:
+                log.exception("Leaderboard rebuild of %r failed (attempt %d); retrying", part, failures[part])
+                retry.append(part)
+            else:
+                log.exception("Leaderboard rebuild of %r failed %d times; dropping it until the next request",
+                              part, failures.pop(part))
+    return retry
+
+def run_rebuild_worker(r, stop=None, poll_seconds=5):
+    """Serve rebuild requests until stop (a threading.Event) is set."""
+    failures = {}
+    while not (stop and stop.is_set()):
+        try:
+            request = r.blpop(REBUILD_QUEUE_KEY, timeout=poll_seconds)
+            if request is None:
+                continue
+            time.sleep(REBUILD_DEBOUNCE_SECONDS)
+            retry = _run_rebuild_parts(r, _drain_rebuild_requests(r, request[1]), failures)
+            if retry:
+                attempts = max(failures[part] for part in retry)
+                time.sleep(min(REBUILD_RETRY_SECONDS * 2 ** (attempts - 1), REBUILD_MAX_BACKOFF_SECONDS))
+                r.rpush(REBUILD_QUEUE_KEY, *retry)
+        except Exception:
+            log.exception("Leaderboard rebuild worker error")
+            time.sleep(poll_seconds)
+
+def start_rebuild_worker(r):
+    """Start this process's rebuild worker thread if it is not already running."""
+    global _rebuild_worker
+    with _rebuild_worker_lock:
+        if _rebuild_worker is None or not _rebuild_worker.is_alive():
+            _rebuild_worker = threading.Thread(
+                target=run_rebuild_worker, args=(r,), name="leaderboard-rebuild", daemon=True
+            )
+            _rebuild_worker.start()
+
+# --- SUBMISSION QUEUES ---
+# Pending PB and championship submissions live in Redis Streams read
+# through one consumer group. Each admin session claims a batch, so two
+# people working the queue see different entries; entries left claimed by
+# a closed session are re-claimed after QUEUE_CLAIM_IDLE_MS. Anything still
+# pushed onto the old pending_results / champ_pending lists is moved into
+# the stream on the next read.
+PB_QUEUE_KEY = "pending_results_stream"
+CHAMP_QUEUE_KEY = "champ_pending_stream"
+LEGACY_QUEUE_KEYS = {PB_QUEUE_KEY: "pending_results", CHAMP_QUEUE_KEY: "champ_pending"}
+QUEUE_GROUP = "admins"
+QUEUE_BATCH_SIZE = 25
+QUEUE_CLAIM_IDLE_MS = 10 * 60 * 1000
+
+def _ensure_queue(r, stream):
+    try:
+        r.xgroup_create(stream, QUEUE_GROUP, id="0", mkstream=True)
+    except redis.ResponseError as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+    legacy = LEGACY_QUEUE_KEYS[stream]
+    pipe = r.pipeline()
+    pipe.lrange(legacy, 0, -1)
+    pipe.delete(legacy)
+    moved = pipe.execute()[0]
+    if moved:
+        pipe = r.pipeline()
+        for raw in moved:
+            pipe.xadd(stream, {"data": raw})
+        pipe.execute()
+
+def queue_submission(r, stream, submission):
+    """Add a submission dict to PB_QUEUE_KEY or CHAMP_QUEUE_KEY. Returns its entry ID."""
+    return r.xadd(stream, {"data": json.dumps(submission)})
+
+def claim_submissions(r, stream, consumer, count=QUEUE_BATCH_SIZE):
+    """
+    Return up to count (entry_id, raw_json) pairs claimed by this consumer:
+    its own unfinished batch first, then abandoned entries, then new ones.
+    """
+    _ensure_queue(r, stream)
+    claimed = r.xreadgroup(QUEUE_GROUP, consumer, {stream: "0"}, count=count)
+    entries = claimed[0][1] if claimed else []
+    if len(entries) < count:
+        entries += r.xautoclaim(stream, QUEUE_GROUP, consumer, QUEUE_CLAIM_IDLE_MS, count=count - len(entries))[1]
+    if len(entries) < count:
+        fresh = r.xreadgroup(QUEUE_GROUP, consumer, {stream: ">"}, count=count - len(entries))
+        entries += fresh[0][1] if fresh else []
+    return [(eid, fields["data"]) for eid, fields in entries if fields]
+
+def get_queue_consumer():
+    """Consumer name for this admin session."""
+    if 'queue_consumer' not in st.session_state:
+        st.session_state['queue_consumer'] = f"admin-{uuid.uuid4().hex[:8]}"
+    return st.session_state['queue_consumer']
+
+def clear_submission_queues(r):
+    """Drop every pending submission."""
+    r.delete(PB_QUEUE_KEY, CHAMP_QUEUE_KEY, *LEGACY_QUEUE_KEYS.values())
+
+# --- APPROVALS ---
+# Approving submissions acks and deletes their stream entries, stores the
+# results with their indexes in one WATCH/MULTI transaction, so two admins
+# can never approve the same entry. Bulk approvals go through the same
+# transaction.
+def _stream_id_key(entry_id):
+    return tuple(int(part) for part in entry_id.split('-'))
+
+def _approve(r, stream, items, season=None):
+    """
+    Remove each (entry_id, champ_entry, pb_entry) from stream and store its
+    entries atomically, championship entries going into season (the current
+    one by default); items no longer claimed are skipped.
+    Returns {entry_id: result_id or None} for the items approved.
+    """
+    age_mode = get_club_age_mode(r)
+    champ_entries = _assign_champ_ids(r, [champ for _, champ, _ in items if champ is not None])
+    if champ_entries:
+        season = str(season or get_champ_season(r))
+    pb_items = [item for item in items if item[2] is not None]
+    for _, _, pb_entry in pb_items:
+        _set_category(pb_entry, age_mode)
+    last = r.incrby(RESULTS_SEQ_KEY, len(pb_items)) if pb_items else 0
+    rids = {item[0]: str(last - len(pb_items) + 1 + n) for n, item in enumerate(pb_items)}
+    ordered = sorted((item[0] for item in items), key=_stream_id_key)
+    state = {}
+
+    def _move(pipe):
+        if not ordered:
+            return {}
+        claimed = {p['message_id'] for p in pipe.xpending_range(
+            stream, QUEUE_GROUP, min=ordered[0], max=ordered[-1], count=max(pipe.xlen(stream), 1))}
+        todo = [item for item in items if item[0] in claimed]
+        if not todo:
+            return {}
+        changes = {rids[eid]: pb for eid, _, pb in todo if pb is not None}
+        champ_rows = [champ for _, champ, _ in todo if champ is not None]
+        standings = []
+        if champ_rows:
+            pipe.watch(*_runner_keys(season, champ_rows))
+            standings = _runner_updates(r, season, added=champ_rows)
+        pipe.multi()
+        pipe.xack(stream, QUEUE_GROUP, *[item[0] for item in todo])
+        pipe.xdel(stream, *[item[0] for item in todo])
+        if champ_rows:
+            pipe.rpush(champ_results_key(season), *[json.dumps(champ) for champ in champ_rows])
+            for champ in champ_rows:
+                _queue_champ_entry(pipe, season, champ)
+            for name, row, old in standings:
+                _queue_standing(pipe, season, name, row, old)
+            pipe.sadd(CHAMP_SEASONS_KEY, season)
+            bump_generation(pipe, "champ")
+        if changes:
+            pipe.hset(RESULTS_KEY, mapping={rid: _encode_result(pb) for rid, pb in changes.items()})
+            for rid, pb in changes.items():
+                _index_result(pipe, rid, pb)
+            bump_generation(pipe, "results")
+        state['pb'] = list(changes.values())
+        return {eid: rids.get(eid) for eid, _, _ in todo}
+
+    approved = r.transaction(_move, stream, value_from_callable=True)
+    if state.get('pb'):
+        patch_pb_leaders(r, state['pb'])
+    return approved
+
+def approve_pb_submission(r, entry_id, entry):
+    """Approve a claimed PB submission. Returns the new result ID, or None if already handled."""
+    return _approve(r, PB_QUEUE_KEY, [(entry_id, None, entry)]).get(entry_id)
+
+def approve_pb_submissions(r, items):
+    """Approve claimed PB submissions given as (entry_id, entry) pairs. Returns the number approved."""
+    return len(_approve(r, PB_QUEUE_KEY, [(eid, None, entry) for eid, entry in items]))
+
+def approve_champ_submission(r, entry_id, champ_entry, pb_entry=None, season=None):
+    """Approve a claimed championship submission, optionally logging it as a PB too. Returns True if approved."""
+    return entry_id in _approve(r, CHAMP_QUEUE_KEY, [(entry_id, champ_entry, pb_entry)], season)
+
+def approve_champ_submissions(r, items, season=None):
+    """Approve claimed championship submissions given as (entry_id, champ_entry, pb_entry). Returns the number approved."""
+    return len(_approve(r, CHAMP_QUEUE_KEY, items, season))
+
+def reject_submission(r, stream, entry_id):
+    """Ack and drop one claimed submission. Returns True if it was still queued."""
+    return reject_submissions(r, stream, [entry_id]) > 0
+
+def reject_submissions(r, stream, entry_ids):
+    """Ack and drop claimed submissions. Returns the number removed."""
+    if not entry_ids:
+        return 0
+    pipe = r.pipeline()
+    pipe.xack(stream, QUEUE_GROUP, *entry_ids)
+    pipe.xdel(stream, *entry_ids)
+    return pipe.execute()[1]
+
+# --- SNAPSHOT READS ---
+# fetch_snapshot() reads any mix of datasets in a single MULTI round trip,
+# so a page gets one consistent view instead of a call per key. Each reader
+# queues its commands on the pipeline and decodes its own replies.
+DEFAULT_CLUB_SETTINGS = {"club_name": "Bramley Breezers", "logo_url": ""}
+
+def _json_list(raw):
+    return [json.loads(x) for x in raw]
+
+def _decode_champ_seasons(r, replies):
+    current = replies[0] or str(datetime.now().year)
+    return current, sorted(set(replies[1]) | {current}, reverse=True)
+
+_SNAPSHOT_READERS = {
+    "members": (1, lambda p, s: p.lrange("members", 0, -1), lambda r, v: _json_list(v[0])),
+    "race_results": (1, lambda p, s: p.hgetall(RESULTS_KEY),
+                     lambda r, v: [_decode_result(rid, v[0][rid]) for rid in sorted(v[0], key=int)]),
+    "result_count": (2, lambda p, s: (p.hlen(RESULTS_KEY), p.hvals(ARCHIVE_COUNTS_KEY)),
+                     lambda r, v: v[0] + sum(int(n) for n in v[1])),
+    "champ_results": (1, lambda p, s: p.lrange(champ_results_key(s), 0, -1), lambda r, v: _json_list(v[0])),
+    "champ_calendar": (1, lambda p, s: p.get(champ_calendar_key(s)), lambda r, v: json.loads(v[0]) if v[0] else None),
+    "club_settings": (1, lambda p, s: p.get("club_settings"),
+                      lambda r, v: json.loads(v[0]) if v[0] else dict(DEFAULT_CLUB_SETTINGS)),
+    "pb_pending_count": (2, lambda p, s: (p.xlen(PB_QUEUE_KEY), p.llen(LEGACY_QUEUE_KEYS[PB_QUEUE_KEY])),
+                         lambda r, v: sum(v)),
+    "champ_pending_count": (2, lambda p, s: (p.xlen(CHAMP_QUEUE_KEY), p.llen(LEGACY_QUEUE_KEYS[CHAMP_QUEUE_KEY])),
+                            lambda r, v: sum(v)),
+    "champ_standings": (3, lambda p, s: _queue_standings_read(p, s), lambda r, v: v),
+    "champ_seasons": (2, lambda p, s: (p.get(CHAMP_SEASON_KEY), p.smembers(CHAMP_SEASONS_KEY)), _decode_champ_seasons),
+}
+_SEASON_READERS = {"champ_results", "champ_calendar", "champ_standings"}
+
+def fetch_snapshot(r, *names, season=None):
+    """
+    Read the named datasets in one MULTI round trip. Returns {name: decoded
+    value}; championship datasets are for season (the current one by default,
+    which costs one extra round trip). "champ_seasons" is (current season,
+    every season newest first).
+    """
+    if season is None and _SEASON_READERS.intersection(names):
+        season = get_champ_season(r)
+    pipe = r.pipeline(transaction=True)
+    for name in names:
+        _SNAPSHOT_READERS[name][1](pipe, str(season))
+    replies = pipe.execute()
+    snapshot, pos = {}, 0
+    for name in names:
+        n, _, decode = _SNAPSHOT_READERS[name]
+        snapshot[name] = decode(r, replies[pos:pos + n])
+        pos += n
+    return snapshot
@@ -1,6 +1,6 @@
 import streamlit as st
 import json
-from helpers import get_redis, rebuild_leaderboard_cache
+from helpers import get_redis, approve_pb_submission, approve_pb_submissions, reject_submission, reject_submissions, claim_submissions, fetch_snapshot, get_queue_consumer, PB_QUEUE_KEY
 
 st.set_page_config(page_title="PB Submissions", layout="wide")
 r = get_redis()
@@ -10,21 +10,28 @@ if not st.session_state.get('authenticated'):
     st.stop()
 
 st.header("📥 Pending PB Submissions")
-pending = r.lrange("pending_results", 0, -1)
+pending = claim_submissions(r, PB_QUEUE_KEY, get_queue_consumer())
 
 if not pending:
     st.info("No pending PBs.")
 else:
-    for i, p_raw in enumerate(pending):
-        p = json.loads(p_raw)
+    st.caption(f"{fetch_snapshot(r, 'pb_pending_count')['pb_pending_count']} pending, {len(pending)} claimed by this session")
+    pending = [(entry_id, json.loads(p_raw)) for entry_id, p_raw in pending]
+    selected = st.multiselect("Bulk select", range(len(pending)),
+                              format_func=lambda i: f"{pending[i][1]['name']} - {pending[i][1]['distance']} ({pending[i][1]['time_display']})")
+    c1, c2 = st.columns(2)
+    if c1.button("✅ Approve Selected", disabled=not selected):
+        approve_pb_submissions(r, [pending[i] for i in selected])
+        st.rerun()
+    if c2.button("❌ Reject Selected", disabled=not selected):
+        reject_submissions(r, PB_QUEUE_KEY, [pending[i][0] for i in selected])
+        st.rerun()
+    for i, (entry_id, p) in enumerate(pending):
         with st.expander(f"{p['name']} - {p['distance']} ({p['time_display']})"):
             if st.button("✅ Approve", key=f"ap_{i}"):
-                r.rpush("race_results", p_raw)
-                r.lset("pending_results", i, "WIPE")
-                r.lrem("pending_results", 1, "WIPE")
-                rebuild_leaderboard_cache(r)
+                if approve_pb_submission(r, entry_id, p) is None:
+                    st.warning("Already handled by another admin.")
                 st.rerun()
             if st.button("❌ Reject", key=f"rj_{i}"):
-                r.lset("pending_results", i, "WIPE")
-                r.lrem("pending_results", 1, "WIPE")
+                reject_submission(r, PB_QUEUE_KEY, entry_id)
                 st.rerun()
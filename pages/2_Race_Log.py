@@ -1,7 +1,7 @@
 import streamlit as st
 import json
 import pandas as pd
-from helpers import get_redis, rebuild_leaderboard_cache
+from helpers import get_redis, get_race_results_page, update_race_result, delete_race_result
 
 st.set_page_config(page_title="Race Log", layout="wide")
 r = get_redis()
@@ -13,14 +13,20 @@ if not st.session_state.get('authenticated'):
 st.header("📑 Master Race Log")
 st.write("View, Edit, or Delete any PB entry in the database.")
 
-raw = r.lrange("race_results", 0, -1)
+f1, f2, f3 = st.columns(3)
+f_dist = f1.selectbox("Distance", ["All", "5k", "10k", "10 Mile", "HM", "Marathon"], key="log_dist")
+per_page = f2.selectbox("Rows per page", [25, 50, 100, 250], key="log_per_page")
+page = f3.number_input("Page", min_value=1, value=1, key="log_page")
 
-if raw:
+# Only the requested page is fetched (newest first) from the date index
+data, total = get_race_results_page(r, int(page), per_page, distance=None if f_dist == "All" else f_dist)
+
+if data:
     # Convert Redis data to DataFrame for display
-    data = [json.loads(x) for x in raw]
     df = pd.DataFrame(data)
     
     # Show the log
+    st.caption(f"Page {int(page)} of {max(1, -(-total // per_page))} ({total} entries)")
     st.dataframe(df, use_container_width=True)
     
     col1, col2 = st.columns(2)
@@ -53,11 +59,12 @@ if raw:
                         "time_seconds": new_sec
                     }
                     
-                    # Update Redis: Set at index, then rebuild cache
-                    r.lset("race_results", int(edit_idx), json.dumps(updated_entry))
-                    rebuild_leaderboard_cache(r)
-                    st.success("Entry updated and cache rebuilt!")
-                    st.rerun()
+                    # Update Redis by stable ID; the leaders cache is patched in place
+                    if update_race_result(r, target['id'], updated_entry):
+                        st.success("Entry updated!")
+                        st.rerun()
+                    else:
+                        st.error("Entry was deleted by another admin.")
 
     with col2:
         with st.expander("🗑️ Delete an Entry"):
@@ -65,11 +72,10 @@ if raw:
             st.warning(f"Deleting entry for {df.iloc[del_idx]['name']} at {df.iloc[del_idx]['location']}")
             
             if st.button("Confirm Delete"):
-                # Standard LREM pattern
-                r.lset("race_results", int(del_idx), "WIPE")
-                r.lrem("race_results", 1, "WIPE")
-                rebuild_leaderboard_cache(r)
+                delete_race_result(r, data[del_idx]['id'])
                 st.success("Entry deleted!")
                 st.rerun()
+elif total:
+    st.info("No entries on this page.")
 else:
     st.info("No race results found in the database.")
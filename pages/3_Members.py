@@ -1,6 +1,6 @@
 import streamlit as st
 import json
-from helpers import get_redis
+from helpers import get_redis, update_member_results, request_leaderboard_rebuild, bump_generation
 
 # Page Config
 st.set_page_config(page_title="Member Management", layout="wide")
@@ -34,6 +34,8 @@ with st.expander("➕ Add New Member", expanded=False):
                 "status": "Active"
             }
             r.rpush("members", json.dumps(m_data))
+            bump_generation(r, "members")
+            request_leaderboard_rebuild(r, "leaders")
             st.success(f"Added {new_name}")
             st.rerun()
 
@@ -73,11 +75,16 @@ for i, m in enumerate(mems):
                 }
                 # Replace in Redis
                 r.lset("members", i, json.dumps(updated_m))
+                bump_generation(r, "members")
+                results_changed = update_member_results(r, m['name'], new_name=edit_name, dob=edit_dob, gender=edit_gen)
+                request_leaderboard_rebuild(r, "pb" if results_changed else "leaders")
                 st.success("Updated!")
                 st.rerun()
             
             # Delete Logic
             if c6.form_submit_button("🗑️ Delete Member"):
                 r.lrem("members", 1, json.dumps(m))
+                bump_generation(r, "members")
+                request_leaderboard_rebuild(r, "leaders")
                 st.warning(f"Deleted {m['name']}")
                 st.rerun()
@@ -2,17 +2,25 @@ import streamlit as st
 import json
 import pandas as pd
 from datetime import datetime
-from helpers import get_redis, get_club_settings, get_category, rebuild_leaderboard_cache
+from helpers import get_redis, get_champ_standings, fetch_snapshot, get_category, request_leaderboard_rebuild, approve_champ_submission, claim_submissions, get_queue_consumer, set_champ_season, save_champ_calendar, update_champ_result, delete_champ_result, CHAMP_QUEUE_KEY
 
 st.set_page_config(page_title="Champ Management", layout="wide")
 r = get_redis()
-settings = get_club_settings()
 
 if not st.session_state.get('authenticated'):
     st.warning("Please login on the Home page.")
     st.stop()
 
 st.header("🏅 Championship Management")
+# The season list and the picked season's data come back in one round trip
+season = st.session_state.get("champ_season_select")
+snap = fetch_snapshot(r, "champ_seasons", "club_settings", "members", "champ_calendar", "champ_results", "champ_standings", "champ_pending_count", season=season)
+current_season, seasons = snap["champ_seasons"]
+seasons = [str(int(seasons[0]) + 1)] + seasons
+if season is not None and season not in seasons:
+    del st.session_state["champ_season_select"]
+    st.rerun()
+season = st.selectbox("Season", seasons, index=seasons.index(current_season), key="champ_season_select")
 tabs = st.tabs(["📥 Pending Approvals", "🗓️ Calendar Setup", "📊 Championship Log", "🏆 Leaderboard"])
 
 def get_seconds(t_str):
@@ -23,17 +31,17 @@ def get_seconds(t_str):
     except: return 0
     return 0
 
-raw_mems = r.lrange("members", 0, -1)
-member_db = {json.loads(m)['name']: json.loads(m) for m in raw_mems}
-cal_raw = r.get("champ_calendar_2026")
-champ_calendar = json.loads(cal_raw) if cal_raw else []
+settings = snap["club_settings"]
+member_db = {m['name']: m for m in snap["members"]}
+champ_calendar = snap["champ_calendar"] or []
 
 with tabs[0]: # --- PENDING APPROVALS ---
-    pending = r.lrange("champ_pending", 0, -1)
+    pending = claim_submissions(r, CHAMP_QUEUE_KEY, get_queue_consumer())
     if not pending:
         st.info("No pending championship results.")
     else:
-        for i, p_raw in enumerate(pending):
+        st.caption(f"{snap['champ_pending_count']} pending, {len(pending)} claimed by this session")
+        for i, (entry_id, p_raw) in enumerate(pending):
             p = json.loads(p_raw)
             with st.expander(f"Review: {p['name']} - {p['race_name']}"):
                 st.write(f"**Submitted Time:** {p['time_display']}")
@@ -71,14 +79,12 @@ with tabs[0]: # --- PENDING APPROVALS ---
                     cat = get_category(m_info.get('dob','2000-01-01'), final_date, settings.get('age_mode', 'Age on Day'))
                     
                     champ_entry = {"name": p['name'], "race_name": p['race_name'], "date": final_date, "points": pts, "category": cat, "gender": m_info.get('gender', 'U')}
-                    r.rpush("champ_results_final", json.dumps(champ_entry))
-                    
+                    pb_entry = None
                     if log_pb:
                         pb_entry = {"name": p['name'], "distance": pb_dist, "location": p['race_name'], "race_date": final_date, "time_display": p['time_display'], "time_seconds": runner_sec, "gender": m_info.get('gender', 'U'), "dob": m_info.get('dob', '2000-01-01')}
-                        r.rpush("race_results", json.dumps(pb_entry))
                     
-                    rebuild_leaderboard_cache(r)
-                    r.lset("champ_pending", i, "WIPE"); r.lrem("champ_pending", 1, "WIPE")
+                    if not approve_champ_submission(r, entry_id, champ_entry, pb_entry, season):
+                        st.warning("Already handled by another admin."); st.rerun()
                     st.success(f"Approved {p['name']}!"); st.rerun()
 
 with tabs[1]: # --- CALENDAR SETUP ---
@@ -100,24 +106,26 @@ with tabs[1]: # --- CALENDAR SETUP ---
                     c2.info("Date: TBC"); c3.info("Dist: TBC"); c4.info("Terrain: TBC")
                 else:
                     try: d_val = datetime.strptime(champ_calendar[i]['date'], '%Y-%m-%d')
-                    except: d_val = datetime(2026, 1, 1)
+                    except: d_val = datetime(int(season), 1, 1)
                     d = c2.date_input("Date", d_val, key=f"d_{i}", label_visibility="collapsed")
                     di = c3.selectbox("Dist", ["5k", "10k", "10 Mile", "HM", "Marathon"], index=["5k", "10k", "10 Mile", "HM", "Marathon"].index(champ_calendar[i].get('distance', '5k')) if champ_calendar[i].get('distance') != "TBC" else 0, key=f"di_{i}", label_visibility="collapsed")
                     te = c4.selectbox("Terrain", ["Road", "Trail", "Fell", "XC"], index=["Road", "Trail", "Fell", "XC"].index(champ_calendar[i].get('terrain', 'Road')) if champ_calendar[i].get('terrain') != "TBC" else 0, key=f"te_{i}", label_visibility="collapsed")
             else:
-                d, di, te = "Any 2026 Marathon", "Marathon", "Road"
+                d, di, te = f"Any {season} Marathon", "Marathon", "Road"
                 c2.write(d); c3.write(di); c4.write(te)
             updated_cal.append({"name": n, "date": str(d), "distance": di, "terrain": te})
             st.divider()
         if st.form_submit_button("Save Calendar"):
-            r.set("champ_calendar_2026", json.dumps(updated_cal))
-            rebuild_leaderboard_cache(r)
+            save_champ_calendar(r, season, updated_cal)
+            request_leaderboard_rebuild(r)
             st.success("Calendar Saved and Cache Rebuilt!"); st.rerun()
+    if season != current_season and st.button(f"Make {season} the Current Season"):
+        set_champ_season(r, season)
+        st.success(f"New championship results now go into {season}"); st.rerun()
 
 with tabs[2]: # --- CHAMPIONSHIP LOG ---
-    final_raw = r.lrange("champ_results_final", 0, -1)
-    if final_raw:
-        data = [json.loads(x) for x in final_raw]
+    data = snap["champ_results"]
+    if data:
         df = pd.DataFrame(data)
         st.dataframe(df, use_container_width=True)
         e_col, d_col = st.columns(2)
@@ -130,16 +138,22 @@ with tabs[2]: # --- CHAMPIONSHIP LOG ---
                     new_cat = st.text_input("Category", t_to_edit.get('category'))
                     if st.form_submit_button("Save Changes"):
                         t_to_edit['points'] = new_pts; t_to_edit['category'] = new_cat
-                        r.lset("champ_results_final", int(idx), json.dumps(t_to_edit))
-                        rebuild_leaderboard_cache(r); st.success("Updated!"); st.rerun()
+                        if not update_champ_result(r, season, int(idx), t_to_edit):
+                            st.warning("Changed by another admin."); st.stop()
+                        st.success("Updated!"); st.rerun()
         with d_col:
             with st.expander("🗑️ Delete Result"):
                 del_idx = st.number_input("Index to Delete", 0, len(df)-1, 0, key="c_del_idx")
                 if st.button("Confirm Deletion"):
-                    r.lset("champ_results_final", int(del_idx), "WIPE"); r.lrem("champ_results_final", 1, "WIPE")
-                    rebuild_leaderboard_cache(r); st.success("Deleted!"); st.rerun()
+                    if not delete_champ_result(r, season, int(del_idx), data[del_idx].get('id')):
+                        st.warning("Changed by another admin."); st.stop()
+                    st.success("Deleted!"); st.rerun()
 
 with tabs[3]: # --- LEADERBOARD ---
-    cache = r.get("cached_champ_standings")
-    if cache: st.table(pd.read_json(cache))
-    else: st.info("Standings not yet generated.")
+    standings = get_champ_standings(r, snap["champ_standings"], season=season)
+    if standings is not None:
+        view = st.selectbox("Standings", ["Overall", "Male", "Female"] + sorted(standings['category'].dropna().unique()))
+        if view in ("Male", "Female"): standings = get_champ_standings(r, season=season, gender=view)
+        elif view != "Overall": standings = get_champ_standings(r, season=season, category=view)
+        st.table(standings)
+    else: st.info("Standings not available yet (generated in the background).")
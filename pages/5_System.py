@@ -2,7 +2,7 @@ import streamlit as st
 import json
 import os
 import pandas as pd
-from helpers import get_redis, get_club_settings, rebuild_leaderboard_cache
+from helpers import get_redis, bump_generation, get_club_settings, rebuild_leaderboard_cache, request_leaderboard_rebuild, clear_race_results, import_members, import_race_results, import_champ_results, import_csv, clear_submission_queues, fetch_snapshot, set_champ_season, save_champ_calendar, export_champ_seasons, clear_champ_seasons, get_archived_results, LEGACY_CHAMP_SEASON
 
 st.set_page_config(page_title="System Settings", layout="wide")
 r = get_redis()
@@ -25,19 +25,23 @@ with tabs[0]: # --- CONFIGURATION ---
         if st.form_submit_button("Save Settings"):
             new_settings = {"club_name": club_name, "logo_url": logo_url}
             r.set("club_settings", json.dumps(new_settings))
-            rebuild_leaderboard_cache(r)
+            bump_generation(r, "settings")
+            request_leaderboard_rebuild(r)
             st.success("Settings saved!")
             st.rerun()
 
 with tabs[1]: # --- BACKUP & EXPORT ---
     st.subheader("Database Portability")
     st.write("Export your entire database as a JSON file for a full system restore.")
+    snap = fetch_snapshot(r, "members", "race_results", "champ_results", "champ_calendar", "club_settings", "champ_seasons")
     db_export = {
-        "members": [json.loads(m) for m in r.lrange("members", 0, -1)],
-        "race_results": [json.loads(res) for res in r.lrange("race_results", 0, -1)],
-        "champ_results_final": [json.loads(c) for c in r.lrange("champ_results_final", 0, -1)],
-        "champ_calendar": json.loads(r.get("champ_calendar_2026") or "[]"),
-        "club_settings": settings
+        "members": snap["members"],
+        "race_results": snap["race_results"] + get_archived_results(r),
+        "champ_results_final": snap["champ_results"],
+        "champ_calendar": snap["champ_calendar"] or [],
+        "champ_season": snap["champ_seasons"][0],
+        "champ_seasons": export_champ_seasons(r),
+        "club_settings": snap["club_settings"]
     }
     json_str = json.dumps(db_export, indent=2)
     st.download_button(
@@ -54,13 +58,21 @@ with tabs[1]: # --- BACKUP & EXPORT ---
         if st.button("⚠️ Confirm Full Restore"):
             data = json.load(uploaded_json)
             r.delete("members")
-            for m in data.get("members", []): r.rpush("members", json.dumps(m))
-            r.delete("race_results")
-            for res in data.get("race_results", []): r.rpush("race_results", json.dumps(res))
-            r.delete("champ_results_final")
-            for c in data.get("champ_results_final", []): r.rpush("champ_results_final", json.dumps(c))
-            r.set("champ_calendar_2026", json.dumps(data.get("champ_calendar", [])))
-            rebuild_leaderboard_cache(r)
+            import_members(r, pd.DataFrame(data.get("members", [])))
+            clear_race_results(r)
+            import_race_results(r, pd.DataFrame(data.get("race_results", [])))
+            clear_champ_seasons(r)
+            # Backups from before seasons hold a single 2026 championship
+            champ_seasons = data.get("champ_seasons") or {
+                LEGACY_CHAMP_SEASON: {"results": data.get("champ_results_final", []), "calendar": data.get("champ_calendar", [])}
+            }
+            for season, champ in champ_seasons.items():
+                import_champ_results(r, pd.DataFrame(champ.get("results", [])), season=season)
+                save_champ_calendar(r, season, champ.get("calendar", []))
+            if data.get("champ_season"):
+                set_champ_season(r, data["champ_season"])
+            bump_generation(r, "members", "champ")
+            request_leaderboard_rebuild(r)
             st.success("System Restored.")
             st.rerun()
 
@@ -72,40 +84,27 @@ with tabs[2]: # --- BULK UPLOAD ---
         st.caption("Required Columns: name, dob, gender, status")
         up_m = st.file_uploader("Choose Members CSV", type="csv", key="up_m")
         if up_m and st.button("Upload Members"):
-            df_m = pd.read_csv(up_m)
-            for _, row in df_m.iterrows():
-                m_data = {"name": str(row['name']), "dob": str(row['dob']), "gender": str(row['gender']), "status": str(row['status'])}
-                r.rpush("members", json.dumps(m_data))
-            st.success(f"Added {len(df_m)} members.")
+            bar = st.progress(0.0)
+            _, added = import_csv(r, up_m, import_members, on_progress=lambda n, i, f: bar.progress(f or 0.0, text=f"{n} rows read"))
+            st.success(f"Added {added} members.")
 
     with st.expander("Import Race Results / PBs (CSV)"):
         st.caption("Required Columns: name, distance, location, race_date, time_display, time_seconds, gender, dob")
         up_r = st.file_uploader("Choose Results CSV", type="csv", key="up_r")
         if up_r and st.button("Upload Results"):
-            df_r = pd.read_csv(up_r)
-            for _, row in df_r.iterrows():
-                r_data = {
-                    "name": str(row['name']), "distance": str(row['distance']), "location": str(row['location']),
-                    "race_date": str(row['race_date']), "time_display": str(row['time_display']),
-                    "time_seconds": int(row['time_seconds']), "gender": str(row['gender']), "dob": str(row['dob'])
-                }
-                r.rpush("race_results", json.dumps(r_data))
-            rebuild_leaderboard_cache(r)
-            st.success(f"Added {len(df_r)} race results.")
+            bar = st.progress(0.0)
+            _, added = import_csv(r, up_r, import_race_results, on_progress=lambda n, i, f: bar.progress(f or 0.0, text=f"{n} rows read"))
+            request_leaderboard_rebuild(r)
+            st.success(f"Added {added} race results.")
 
     with st.expander("Import Championship Results (CSV)"):
         st.caption("Required Columns: name, race_name, date, points, category, gender")
         up_c = st.file_uploader("Choose Champ CSV", type="csv", key="up_c")
         if up_c and st.button("Upload Champ Results"):
-            df_c = pd.read_csv(up_c)
-            for _, row in df_c.iterrows():
-                c_data = {
-                    "name": str(row['name']), "race_name": str(row['race_name']), "date": str(row['date']),
-                    "points": float(row['points']), "category": str(row['category']), "gender": str(row['gender'])
-                }
-                r.rpush("champ_results_final", json.dumps(c_data))
-            rebuild_leaderboard_cache(r)
-            st.success(f"Added {len(df_c)} championship entries.")
+            bar = st.progress(0.0)
+            _, added = import_csv(r, up_c, import_champ_results, on_progress=lambda n, i, f: bar.progress(f or 0.0, text=f"{n} rows read"))
+            request_leaderboard_rebuild(r)
+            st.success(f"Added {added} championship entries.")
 
 with tabs[3]: # --- SYNC & MAINTENANCE ---
     st.subheader("Maintenance Tools")
@@ -117,6 +116,5 @@ with tabs[3]: # --- SYNC & MAINTENANCE ---
     st.divider()
     with st.expander("🗑️ Danger Zone"):
         if st.button("Clear Pending Approval Queues"):
-            r.delete("pending_results")
-            r.delete("champ_pending")
+            clear_submission_queues(r)
             st.warning("Pending queues cleared.")
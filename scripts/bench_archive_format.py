@@ -0,0 +1,74 @@
+"""
+Compare the PBL1 archive blob with the df.to_json() payload the old
+cached_pb_leaderboard snapshot used: size, encode time and decode time on
+synthetic race results. Needs no Redis.
+
+    python scripts/bench_archive_format.py [rows]
+"""
+import io
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from helpers import DISTANCES, GENDERS, _archive_rows, _encode_archive
+
+
+def synthetic_results(n, seed=21):
+    rng = random.Random(seed)
+    names = [f"Runner {i}" for i in range(max(n // 20, 1))]
+    locations = [f"Race {i}" for i in range(60)]
+    rows = {}
+    for rid in range(1, n + 1):
+        secs = rng.randrange(900, 18000)
+        rows[str(rid)] = {
+            "name": rng.choice(names),
+            "gender": rng.choice(GENDERS),
+            "dob": f"{rng.randrange(1950, 2005)}-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}",
+            "distance": rng.choice(DISTANCES),
+            "time_seconds": secs,
+            "time_display": f"{secs // 3600:02d}:{secs % 3600 // 60:02d}:{secs % 60:02d}",
+            "location": rng.choice(locations),
+            "race_date": f"2025-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}",
+            "category": rng.choice(["Senior", "V35", "V40", "V45", "V50", "V55", "V60"]),
+        }
+    return rows
+
+
+def best_of(fn, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def to_json_payload(rows):
+    df = pd.DataFrame.from_dict(rows, orient="index")
+    df['race_date_dt'] = pd.to_datetime(df['race_date'], errors='coerce')
+    # ISO dates: pandas is deprecating the epoch default the snapshot was written with
+    return df.to_json(date_format='iso')
+
+
+def main(n):
+    rows = synthetic_results(n)
+    json_payload, json_enc = best_of(lambda: to_json_payload(rows))
+    _, json_dec = best_of(lambda: pd.read_json(io.StringIO(json_payload)))
+    blob, blob_enc = best_of(lambda: _encode_archive(rows))
+    decoded, blob_dec = best_of(lambda: _archive_rows(blob))
+    assert decoded == rows
+
+    print(f"{n} results")
+    print(f"  {'format':<8} {'size':>10} {'encode':>10} {'decode':>10}")
+    for name, payload, enc, dec in (("to_json", json_payload, json_enc, json_dec),
+                                    ("PBL1", blob, blob_enc, blob_dec)):
+        print(f"  {name:<8} {len(payload) / 1024:>7.0f} KB {enc * 1000:>7.1f} ms {dec * 1000:>7.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,54 @@
+import random
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+import app
+import helpers
+
+MALFORMED = ["", "TBC", None, "nan", "2020-02-30", "2020-13-01", "2020-1-5", "01/02/1980", " 1980-01-01", 1980]
+
+
+def _random_date(rng, start, end):
+    return (start + timedelta(days=rng.randrange((end - start).days))).isoformat()
+
+
+def _sample(n=3000, seed=6):
+    rng = random.Random(seed)
+    dobs, race_dates = [], []
+    for _ in range(n):
+        roll = rng.random()
+        dob = _random_date(rng, date(1935, 1, 1), date(2012, 1, 1))
+        race_date = _random_date(rng, date(1990, 1, 1), date(2030, 1, 1))
+        if roll < 0.05:
+            dob = rng.choice(MALFORMED)
+        elif roll < 0.10:
+            race_date = rng.choice(MALFORMED)
+        elif roll < 0.15:
+            # Races on or around a birthday, including a leap-day one
+            dob = rng.choice(["1976-02-29", "1980-06-15", "1984-12-31"])
+            race_date = f"{rng.randrange(2010, 2030)}-{rng.choice(['02-28', '03-01', '06-14', '06-15', '12-31'])}"
+        dobs.append(dob)
+        race_dates.append(race_date)
+    return dobs, race_dates
+
+
+@pytest.mark.parametrize("age_mode", ["5Y", "10Y"])
+def test_matches_admin_app(age_mode):
+    dobs, race_dates = _sample()
+    expected = [app.get_category(d, rd, age_mode) for d, rd in zip(dobs, race_dates)]
+    assert helpers.get_categories(dobs, race_dates, age_mode).tolist() == expected
+
+
+def test_matches_age_on_day():
+    dobs, race_dates = _sample()
+    expected = [helpers.get_category(d, rd) for d, rd in zip(dobs, race_dates)]
+    assert helpers.get_categories(dobs, race_dates).tolist() == expected
+
+
+def test_keeps_series_index():
+    dobs = pd.Series(["1980-01-01", "bad"], index=[7, 3])
+    result = helpers.get_categories(dobs, ["2026-01-01", "2026-01-01"], "10Y")
+    assert result.index.tolist() == [7, 3]
+    assert result.tolist() == ["V40", "Unknown"]